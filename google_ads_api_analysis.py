@@ -15,7 +15,10 @@ Functions in this module handle:
 
 All functions work with captured API response dictionaries and use regex patterns
 from google_ads_config.py for parsing. The functions follow consistent patterns
-for error handling and JSON parsing.
+for error handling and JSON parsing. Each response body is decoded at most once
+(see parse_api_response) and the result is cached on the response dictionary.
+Responses are selected by the 'type' key assigned at capture time
+(TrafficTracker.add_api_response), not by re-scanning their URLs.
 
 This module will be imported by google_ads_content.py and google_ads_validation.py
 in subsequent refactoring phases.
@@ -27,6 +30,13 @@ from datetime import datetime
 import codecs
 from typing import List, Dict, Any, Optional, Set
 
+# Import orjson for faster JSON decoding of API responses (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from google_ads_config import (
     PATTERN_CREATIVE_ID_FROM_PAGE_URL,
     PATTERN_CONTENT_JS_URL,
@@ -41,12 +51,93 @@ from google_ads_config import (
     FLETCH_RENDER_MARKER
 )
 
+# Compiled once: applied to every page URL, API response body and content.js
+# URL the analysis helpers look at during the wait loop
+_RE_CREATIVE_ID_FROM_PAGE_URL = re.compile(PATTERN_CREATIVE_ID_FROM_PAGE_URL)
+_RE_CONTENT_JS_URL = re.compile(PATTERN_CONTENT_JS_URL)
+_RE_FLETCH_RENDER_ID = re.compile(PATTERN_FLETCH_RENDER_ID)
+_RE_CREATIVE_ID_FROM_URL = re.compile(PATTERN_CREATIVE_ID_FROM_URL)
+
 
 # ============================================================================
 # API RESPONSE ANALYSIS FUNCTIONS
 # ============================================================================
 
 
+# JSON escapes found in content.js URLs inside API responses
+_URL_FRAGMENT_ESCAPES = (
+    ('\\u003d', '='),
+    ('\\u003D', '='),
+    ('\\u0026', '&')
+)
+
+
+def _unescape_url_fragment(url_fragment: str) -> str:
+    """
+    Undo the JSON \\uXXXX escapes in a content.js URL fragment.
+    
+    Only \\u003d ('=') and \\u0026 ('&') occur in practice, so those are
+    replaced directly; the full codecs 'unicode-escape' decoder runs on the
+    original fragment if any other backslash escape is present (including an
+    escaped backslash, which would make a following "u003d" literal text),
+    and unescaped fragments are returned as-is. For ASCII fragments (URLs)
+    the result equals codecs.decode(url_fragment, 'unicode-escape').
+    
+    Args:
+        url_fragment: URL text as matched in the raw API response body.
+    
+    Returns:
+        The fragment with escapes decoded (unchanged if decoding fails).
+    """
+    if '\\' not in url_fragment:
+        return url_fragment
+    
+    if '\\\\' not in url_fragment:
+        decoded = url_fragment
+        for escape, char in _URL_FRAGMENT_ESCAPES:
+            decoded = decoded.replace(escape, char)
+        if '\\' not in decoded:
+            return decoded
+    
+    try:
+        return codecs.decode(url_fragment, 'unicode-escape')
+    except (UnicodeDecodeError, UnicodeEncodeError):
+        return url_fragment
+
+
+def parse_api_response(api_resp: Dict[str, Any]) -> Optional[Any]:
+    """
+    Decode the JSON body of a captured API response, parsing it at most once.
+    
+    The decoded value is cached on the response dictionary under the 'parsed'
+    key, so every analysis helper called during the wait loop and afterwards
+    shares a single parse. Uses orjson when installed, stdlib json otherwise.
+    
+    Args:
+        api_resp: Captured API response dictionary with a 'text' key.
+    
+    Returns:
+        The decoded JSON value, or None if the body is missing or not valid JSON.
+    
+    Example:
+        data = parse_api_response(api_resp)
+        if isinstance(data, dict):
+            creative_id = data.get('1', {}).get('2', '')
+    """
+    if 'parsed' in api_resp:
+        return api_resp['parsed']
+    
+    text = api_resp.get('text', '')
+    try:
+        # json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError
+        parsed = orjson.loads(text) if ORJSON_AVAILABLE else json.loads(text)
+    except (ValueError, TypeError):
+        parsed = None
+    
+    api_resp['parsed'] = parsed
+    return parsed
+
+
 def extract_expected_fletch_renders_from_api(
     api_responses: List[Dict[str, Any]],
     page_url: str,
@@ -84,7 +175,7 @@ def extract_expected_fletch_renders_from_api(
         # Returns: {'13006300890096633430', '13324661215579882186'}
     """
     # Extract main creative ID from page URL
-    match = re.search(PATTERN_CREATIVE_ID_FROM_PAGE_URL, page_url)
+    match = _RE_CREATIVE_ID_FROM_PAGE_URL.search(page_url)
     if not match:
         return set()
     
@@ -92,9 +183,7 @@ def extract_expected_fletch_renders_from_api(
     
     # Find GetCreativeById response
     for api_resp in api_responses:
-        api_url = api_resp.get('url', '')
-        
-        if API_GET_CREATIVE_BY_ID not in api_url:
+        if api_resp.get('type') != API_GET_CREATIVE_BY_ID:
             continue
         
         try:
@@ -111,22 +200,15 @@ def extract_expected_fletch_renders_from_api(
             # The URLs contain fletch-render IDs and represent our "expected" list
             # Pattern matches: https://displayads-formats.googleusercontent.com/ads/preview/content.js?...
             # Handles both plain and escaped formats (\u003d becomes =, etc.)
-            content_js_urls = re.findall(PATTERN_CONTENT_JS_URL, text)
-            
-            # Extract fletch-render IDs from these URLs
+            # URLs are streamed with finditer() rather than collected into a list first
             expected_fletch_ids = set()
-            for url_fragment in content_js_urls:
+            for url_match in _RE_CONTENT_JS_URL.finditer(text):
                 # Decode unicode escapes if present (\u003d becomes =, \u0026 becomes &)
                 # This handles JSON-escaped URLs in API responses
-                try:
-                    # Use codecs.decode to properly handle \uXXXX unicode escapes
-                    import codecs
-                    decoded_url = codecs.decode(url_fragment, 'unicode-escape')
-                except:
-                    decoded_url = url_fragment
+                decoded_url = _unescape_url_fragment(url_match.group(0))
                 
                 # Extract fletch-render ID
-                fr_match = re.search(PATTERN_FLETCH_RENDER_ID, decoded_url)
+                fr_match = _RE_FLETCH_RENDER_ID.search(decoded_url)
                 if fr_match:
                     expected_fletch_ids.add(fr_match.group(1))
             
@@ -178,7 +260,7 @@ def check_if_static_cached_creative(
             print(f"Static {result['content_type']} ad detected: {result['reason']}")
     """
     # Extract creative ID from URL
-    match = re.search(PATTERN_CREATIVE_ID_FROM_PAGE_URL, page_url)
+    match = _RE_CREATIVE_ID_FROM_PAGE_URL.search(page_url)
     if not match:
         return None
     
@@ -186,7 +268,7 @@ def check_if_static_cached_creative(
     
     # Find GetCreativeById response
     for api_resp in api_responses:
-        if API_GET_CREATIVE_BY_ID not in api_resp.get('url', ''):
+        if api_resp.get('type') != API_GET_CREATIVE_BY_ID:
             continue
         
         try:
@@ -197,24 +279,22 @@ def check_if_static_cached_creative(
                 continue
             
             # Check for different types of cached content markers in API response
+            # - fletch-render: Dynamic content (if present, NOT static)
             # - simgad: Static image ads stored in Google's archive
             # - sadbundle: Cached HTML text ads
             # - archive/index.html: Generic cached content
-            # - fletch-render: Dynamic content (if present, NOT static)
-            has_simgad = STATIC_IMAGE_AD_URL in text
-            has_sadbundle = STATIC_HTML_AD_URL in text
-            has_archive_index = ARCHIVE_PATH in text and ARCHIVE_INDEX_FILE in text
-            has_fletch_render = FLETCH_RENDER_MARKER in text
+            # Markers are tested in decision order and each scan of the body
+            # only runs if the previous ones did not decide the outcome
             
             # If has fletch-render, it's dynamic content (not static)
             # Early exit to avoid false positives
-            if has_fletch_render:
+            if FLETCH_RENDER_MARKER in text:
                 continue
             
             url_creative_id_numeric = url_creative_id.replace('CR', '')
             
             # Case 1: Static image ad (simgad)
-            if has_simgad:
+            if STATIC_IMAGE_AD_URL in text:
                 return {
                     'is_static': True,
                     'creative_id': url_creative_id,
@@ -224,7 +304,8 @@ def check_if_static_cached_creative(
                 }
             
             # Case 2: Cached HTML text ad (sadbundle or other archive index.html)
-            if has_sadbundle or has_archive_index:
+            if (STATIC_HTML_AD_URL in text
+                    or (ARCHIVE_PATH in text and ARCHIVE_INDEX_FILE in text)):
                 return {
                     'is_static': True,
                     'creative_id': url_creative_id,
@@ -233,7 +314,8 @@ def check_if_static_cached_creative(
                     'reason': 'Cached HTML text ad - no dynamic content.js available'
                 }
         
-        except (json.JSONDecodeError, KeyError, TypeError):
+        except TypeError:
+            # Non-string 'text' (nothing here parses JSON or indexes keys)
             continue
     
     return None
@@ -264,7 +346,7 @@ def check_empty_get_creative_by_id(
         to verify creative existence before timing out.
     """
     # Extract creative ID from URL
-    match = re.search(PATTERN_CREATIVE_ID_FROM_PAGE_URL, page_url)
+    match = _RE_CREATIVE_ID_FROM_PAGE_URL.search(page_url)
     if not match:
         return False
     
@@ -272,18 +354,19 @@ def check_empty_get_creative_by_id(
     
     # Find GetCreativeById response
     for api_resp in api_responses:
-        if API_GET_CREATIVE_BY_ID not in api_resp.get('url', ''):
+        if api_resp.get('type') != API_GET_CREATIVE_BY_ID:
+            continue
+        
+        data = parse_api_response(api_resp)
+        if data is None:
             continue
         
         try:
-            text = api_resp.get('text', '').strip()
-            
             # Check if response is empty {}
-            if text == '{}':
+            if data == {}:
                 return True
             
             # Also check if it's valid JSON but doesn't contain our creative
-            data = json.loads(text)
             response_creative_id = data.get('1', {}).get('2', '')
             
             # If it has data but for a different creative, keep looking
@@ -294,7 +377,7 @@ def check_empty_get_creative_by_id(
             if response_creative_id == page_creative_id:
                 return False
                 
-        except (json.JSONDecodeError, KeyError):
+        except (KeyError, AttributeError):
             continue
     
     return False
@@ -329,7 +412,7 @@ def check_creative_in_search_creatives(
                 print("Creative not found - may not exist")
     """
     # Extract creative ID from URL
-    match = re.search(PATTERN_CREATIVE_ID_FROM_PAGE_URL, page_url)
+    match = _RE_CREATIVE_ID_FROM_PAGE_URL.search(page_url)
     if not match:
         return False
     
@@ -337,11 +420,14 @@ def check_creative_in_search_creatives(
     
     # Check SearchCreatives responses
     for api_resp in api_responses:
-        if API_SEARCH_CREATIVES not in api_resp.get('url', ''):
+        if api_resp.get('type') != API_SEARCH_CREATIVES:
+            continue
+        
+        data = parse_api_response(api_resp)
+        if data is None:
             continue
         
         try:
-            data = json.loads(api_resp.get('text', ''))
             creatives_list = data.get('1', [])
             
             for creative in creatives_list:
@@ -349,7 +435,7 @@ def check_creative_in_search_creatives(
                 if creative_id == page_creative_id:
                     return True
                     
-        except (json.JSONDecodeError, KeyError, TypeError):
+        except (KeyError, TypeError, AttributeError):
             continue
     
     return False
@@ -386,7 +472,7 @@ def extract_real_creative_id_from_api(
         # Returns: '773510960098'
     """
     # Extract main creative ID from page URL
-    match = re.search(PATTERN_CREATIVE_ID_FROM_PAGE_URL, page_url)
+    match = _RE_CREATIVE_ID_FROM_PAGE_URL.search(page_url)
     if not match:
         return None
     
@@ -396,12 +482,14 @@ def extract_real_creative_id_from_api(
     # This API returns detailed creative data including content.js URLs
     # Extract creativeId parameter from the first content.js URL
     for api_resp in api_responses:
-        if API_GET_CREATIVE_BY_ID not in api_resp.get('url', ''):
+        if api_resp.get('type') != API_GET_CREATIVE_BY_ID:
+            continue
+        
+        data = parse_api_response(api_resp)
+        if data is None:
             continue
         
         try:
-            data = json.loads(api_resp['text'])
-            
             # Check if this response is for our creative
             response_creative_id = data.get('1', {}).get('2', '')
             
@@ -418,11 +506,11 @@ def extract_real_creative_id_from_api(
             first_url = content_urls[0].get('1', {}).get('4', '')
             
             # Extract creativeId parameter
-            match = re.search(PATTERN_CREATIVE_ID_FROM_URL, first_url)
+            match = _RE_CREATIVE_ID_FROM_URL.search(first_url)
             if match:
                 return match.group(1)
         
-        except (json.JSONDecodeError, KeyError):
+        except (KeyError, AttributeError):
             continue
     
     # Method 2: Fallback to SearchCreatives (contains all advertiser creatives)
@@ -430,13 +518,15 @@ def extract_real_creative_id_from_api(
     # Find our creative in the list and extract its numeric ID
     searched_creatives = False
     for api_resp in api_responses:
-        if API_SEARCH_CREATIVES not in api_resp.get('url', ''):
+        if api_resp.get('type') != API_SEARCH_CREATIVES:
             continue
         
         searched_creatives = True
+        data = parse_api_response(api_resp)
+        if data is None:
+            continue
+        
         try:
-            data = json.loads(api_resp['text'])
-            
             # SearchCreatives returns a list of creatives
             creatives_list = data.get('1', [])
             
@@ -452,12 +542,12 @@ def extract_real_creative_id_from_api(
                     content_url = creative.get('3', {}).get('1', {}).get('4', '')
                     
                     if content_url:
-                        match = re.search(PATTERN_CREATIVE_ID_FROM_URL, content_url)
+                        match = _RE_CREATIVE_ID_FROM_URL.search(content_url)
                         if match:
                             # print(f"   ✅ Found in SearchCreatives: {match.group(1)}")
                             return match.group(1)
         
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
+        except (KeyError, TypeError, AttributeError) as e:
             # print(f"   ⚠️ Error parsing SearchCreatives: {e}")
             continue
     
@@ -493,7 +583,7 @@ def extract_funded_by_from_api(
         # Returns: 'BlueVision Interactive Limited'
     """
     # Extract main creative ID from page URL
-    match = re.search(PATTERN_CREATIVE_ID_FROM_PAGE_URL, page_url)
+    match = _RE_CREATIVE_ID_FROM_PAGE_URL.search(page_url)
     if not match:
         return None
     
@@ -501,12 +591,14 @@ def extract_funded_by_from_api(
     
     # Find GetCreativeById response
     for api_resp in api_responses:
-        if API_GET_CREATIVE_BY_ID not in api_resp.get('url', ''):
+        if api_resp.get('type') != API_GET_CREATIVE_BY_ID:
+            continue
+        
+        data = parse_api_response(api_resp)
+        if data is None:
             continue
         
         try:
-            data = json.loads(api_resp['text'])
-            
             # Check if this response is for our creative
             response_creative_id = data.get('1', {}).get('2', '')
             
@@ -525,7 +617,7 @@ def extract_funded_by_from_api(
                 if funded_by and isinstance(funded_by, str):
                     return funded_by.strip()
         
-        except (json.JSONDecodeError, KeyError, TypeError):
+        except (KeyError, TypeError, AttributeError):
             continue
     
     return None
@@ -546,18 +638,21 @@ def extract_country_presence_from_api(
     Best-effort parsing: returns None if missing or on errors.
     """
     # Extract CR... from page URL
-    match = re.search(PATTERN_CREATIVE_ID_FROM_PAGE_URL, page_url)
+    match = _RE_CREATIVE_ID_FROM_PAGE_URL.search(page_url)
     if not match:
         return None
 
     page_creative_id = match.group(1)
 
     for api_resp in api_responses:
-        if API_GET_CREATIVE_BY_ID not in api_resp.get('url', ''):
+        if api_resp.get('type') != API_GET_CREATIVE_BY_ID:
+            continue
+
+        data = parse_api_response(api_resp)
+        if data is None:
             continue
 
         try:
-            data = json.loads(api_resp.get('text', ''))
             # Unwrap top-level if present
             if isinstance(data, dict) and '1' in data and isinstance(data['1'], dict):
                 data = data['1']
@@ -588,7 +683,7 @@ def extract_country_presence_from_api(
 
             return result or None
 
-        except (json.JSONDecodeError, TypeError, KeyError):
+        except (TypeError, KeyError, AttributeError):
             continue
 
     return None
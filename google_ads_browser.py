@@ -34,9 +34,6 @@ from google_ads_config import (
     BLOCKED_RESOURCE_TYPES,
     GSTATIC_BLOCKED_PATTERNS,
     API_ENDPOINTS,
-    API_GET_CREATIVE_BY_ID,
-    API_SEARCH_CREATIVES,
-    API_GET_ADVERTISER_BY_ID,
     CONTENT_JS_DOMAIN,
     ADVERTISER_PAGE_DOMAIN
 )
@@ -252,21 +249,8 @@ def _create_response_handler(
             if any(api in url for api in API_ENDPOINTS):
                 try:
                     text = await response.text()
-                    
-                    api_type = 'unknown'
-                    if API_GET_CREATIVE_BY_ID in url:
-                        api_type = API_GET_CREATIVE_BY_ID
-                    elif API_SEARCH_CREATIVES in url:
-                        api_type = API_SEARCH_CREATIVES
-                    elif API_GET_ADVERTISER_BY_ID in url:
-                        api_type = API_GET_ADVERTISER_BY_ID
-                    
-                    tracker.api_responses.append({
-                        'url': url,
-                        'text': text,
-                        'type': api_type,
-                        'timestamp': time.time()
-                    })
+                    # Tracker classifies the endpoint and updates its counters
+                    tracker.add_api_response(url, text)
                 except:
                     pass
         
@@ -72,6 +72,7 @@ MITMPROXY_PORT = '8080'  # port for mitmproxy server
 MITMPROXY_SERVER_URL = 'http://localhost:8080'  # full proxy server URL
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"  # browser user agent string
 BLOCKED_RESOURCE_TYPES = ['image', 'font', 'stylesheet']  # resource types to block for bandwidth optimization
+MAX_BLOCKED_URLS_TRACKED = 500  # most recent (url, reason) entries kept in TrafficTracker.blocked_urls
 
 # File paths for proxy and temporary files
 MITM_ADDON_PATH = '/tmp/mitm_addon.py'  # path for mitmproxy addon script
@@ -113,6 +114,7 @@ PATTERN_CONTENT_JS_URL = r'https://displayads-formats\.googleusercontent\.com/ad
 # Content.js detection
 CONTENT_JS_FILENAME = 'content.js'  # filename to detect content.js requests
 CONTENT_JS_DOMAIN = 'displayads-formats.googleusercontent.com'  # domain for content.js files
+CONTENT_JS_URL_PREFIX = 'https://' + CONTENT_JS_DOMAIN  # content.js request URLs always start with this
 ADVERTISER_PAGE_DOMAIN = 'adstransparency.google.com/advertiser/'  # advertiser page domain
 
 # API endpoint names
@@ -165,6 +167,17 @@ VERBOSE_LOGGING = True  # Set to False to suppress detailed logs from external m
 PROXY_ADDON_SCRIPT = f'''
 import json
 
+
+def _byte_len(s):
+    """UTF-8 byte length of s; headers/paths are ASCII in practice (isascii() is O(1))."""
+    return len(s) if s.isascii() else len(s.encode())
+
+
+def _headers_size(headers):
+    """Byte size of headers serialized as "key: value" + CRLF lines."""
+    return sum(_byte_len(k) + _byte_len(v) + 4 for k, v in headers.items())
+
+
 class TrafficCounter:
     def __init__(self):
         self.total_request_bytes = 0
@@ -174,8 +187,9 @@ class TrafficCounter:
     def request(self, flow):
         """Called for each request."""
         request_size = len(flow.request.raw_content) if flow.request.raw_content else 0
-        request_size += sum(len(f"{{{{k}}}}: {{{{v}}}}\\r\\n".encode()) for k, v in flow.request.headers.items())
-        request_size += len(f"{{{{flow.request.method}}}} {{{{flow.request.path}}}} HTTP/1.1\\r\\n".encode())
+        # "{{k}}: {{v}}\\r\\n" per header, "METHOD PATH HTTP/1.1\\r\\n" request line
+        request_size += _headers_size(flow.request.headers)
+        request_size += _byte_len(flow.request.method) + _byte_len(flow.request.path) + 12
         
         self.total_request_bytes += request_size
         self.request_count += 1
@@ -190,7 +204,7 @@ class TrafficCounter:
         else:
             body_size = 0
         
-        headers_size = sum(len(f"{{{{k}}}}: {{{{v}}}}\\r\\n".encode()) for k, v in flow.response.headers.items())
+        headers_size = _headers_size(flow.response.headers)
         response_size = body_size + headers_size
         
         self.total_response_bytes += response_size
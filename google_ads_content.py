@@ -25,6 +25,12 @@ The pipeline consists of three sequential stages:
    - Handles base64-encoded app IDs (if extract_app_ids module available)
    - Processes matched fletch-render content.js files for data extraction
 
+Stages 2 and 3 are CPU-bound and can be run together off the event loop with
+_identify_and_extract(), so the loop keeps servicing network events while a
+finished page is being processed. Callers that run several scrapes on one loop
+and print per-scrape output (e.g. the stress test workers) call the stages
+directly instead, so each scrape's output stays in one block.
+
 The pipeline handles both dynamic content (with fletch-render IDs) and static/cached
 content (images, HTML text ads). It follows the established patterns with comprehensive
 docstrings, type hints, and error handling.
@@ -37,6 +43,7 @@ Dependencies:
     - extract_app_ids: Optional base64 app ID extraction (external module)
 """
 
+import asyncio
 import sys
 import re
 from typing import Dict, List, Tuple, Optional, Set, Any
@@ -53,6 +60,7 @@ from google_ads_config import (
     CONTENT_CHECK_INTERVAL,
     XHR_DETECTION_THRESHOLD,
     SEARCH_CREATIVES_WAIT,
+    API_GET_CREATIVE_BY_ID,
     API_SEARCH_CREATIVES,
     PATTERN_FLETCH_RENDER_ID,
     VERBOSE_LOGGING
@@ -81,10 +89,26 @@ from google_ads_debug import (
 )
 
 
+# Compiled once: matched against every content.js URL on each wait-loop tick
+_FLETCH_RENDER_ID_RE = re.compile(PATTERN_FLETCH_RENDER_ID)
+
+
 # ============================================================================
 # CONTENT PROCESSING PIPELINE FUNCTIONS
 # ============================================================================
 
+def _flush_log_buffer(log_buf: List[str]) -> None:
+    """
+    Write buffered log lines to stdout in a single call and clear the buffer.
+    
+    Args:
+        log_buf: List of pending log lines (without trailing newlines).
+    """
+    if log_buf:
+        sys.stdout.write("\n".join(log_buf) + "\n")
+        log_buf.clear()
+
+
 async def _smart_wait_for_content(
     page,  # Playwright Page instance
     page_url: str,
@@ -107,7 +131,8 @@ async def _smart_wait_for_content(
     4. All expected fletch-renders received: All content captured, exit early
     
     Args:
-        page: Playwright Page instance for timeout operations.
+        page: Playwright Page instance (kept for API compatibility; pacing
+              uses asyncio.sleep and does not touch the page).
         page_url: Target URL being scraped (contains creative ID).
         tracker: TrafficTracker instance with API responses.
         content_js_responses: List of captured (url, text) tuples.
@@ -149,16 +174,34 @@ async def _smart_wait_for_content(
         sys.stdout.flush()  # Force immediate output in concurrent environments
     
     # Initialize state variables
+    # Elapsed time is measured on the event loop's monotonic clock rather than
+    # accumulated per tick, so late wakeups can't push the loop past max_wait
     max_wait = MAX_CONTENT_WAIT
+    loop = asyncio.get_running_loop()
+    start = loop.time()
     elapsed = 0
     expected_fletch_renders = set()
     found_fletch_renders = set()
     critical_errors = []
-    last_api_count = 0
+    # GetCreativeById responses already analyzed; static detection, expected
+    # fletch-renders and the empty check depend only on GetCreativeById, so
+    # they are re-run only when a new one has been captured
+    last_get_creative_count = 0
+    empty_checked_count = 0
     static_content_detected = None
     empty_get_creative_detected = False
     empty_get_creative_detection_time = None
     
+    # Messages produced inside the loop are buffered and written once per tick
+    log_buf = []
+    
+    # Per-endpoint views of the captured responses. The analysis helpers skip
+    # responses of other types, so passing just the relevant bucket avoids
+    # rescanning every captured response on each tick. The buckets are live
+    # lists that grow as the response handler captures new responses.
+    get_creative_responses = tracker.get_api_responses(API_GET_CREATIVE_BY_ID)
+    search_creatives_responses = tracker.get_api_responses(API_SEARCH_CREATIVES)
+    
     # Main wait loop: Check every 0.5s for new content, up to 60s max
     # Multiple early-exit conditions optimize waiting time
     while elapsed < max_wait:
@@ -167,78 +210,75 @@ async def _smart_wait_for_content(
         # Exit early to avoid full 60s timeout
         if elapsed >= XHR_DETECTION_THRESHOLD and len(all_xhr_fetch_requests) == 0:
             if VERBOSE_LOGGING:
-                print(f"  ⚠️  No XHR/fetch requests detected after {elapsed:.1f}s")
-                print(f"  ⚠️  JavaScript may not be executing - exiting wait early")
+                log_buf.append(f"  ⚠️  No XHR/fetch requests detected after {elapsed:.1f}s")
+                log_buf.append(f"  ⚠️  JavaScript may not be executing - exiting wait early")
             break
         
         # Early exit condition 2: Empty GetCreativeById detection
         # When GetCreativeById returns {}, the creative may not exist
         # Wait 3 seconds for SearchCreatives to verify existence
         # If creative not in SearchCreatives, exit early (creative not found)
-        if not empty_get_creative_detected and len(tracker.api_responses) > 0:
+        if not empty_get_creative_detected and tracker.get_creative_by_id_count > empty_checked_count:
+            empty_checked_count = tracker.get_creative_by_id_count
             # Check if GetCreativeById is empty
-            if check_empty_get_creative_by_id(tracker.api_responses, page_url):
+            if check_empty_get_creative_by_id(get_creative_responses, page_url):
                 empty_get_creative_detected = True
                 empty_get_creative_detection_time = elapsed
                 
                 # Check if SearchCreatives already exists
-                has_search_creatives = any(API_SEARCH_CREATIVES in resp.get('url', '') for resp in tracker.api_responses)
-                
-                if has_search_creatives:
+                if tracker.search_creatives_count > 0:
                     # SearchCreatives already arrived, check if creative is in it
-                    creative_in_search = check_creative_in_search_creatives(tracker.api_responses, page_url)
+                    creative_in_search = check_creative_in_search_creatives(search_creatives_responses, page_url)
                     
                     if not creative_in_search:
-                        print(f"  ⚠️  Empty GetCreativeById + creative not in SearchCreatives")
-                        print(f"  ⚠️  Creative not found - exiting wait early at {elapsed:.1f}s")
+                        log_buf.append(f"  ⚠️  Empty GetCreativeById + creative not in SearchCreatives")
+                        log_buf.append(f"  ⚠️  Creative not found - exiting wait early at {elapsed:.1f}s")
                         break
                 else:
                     # SearchCreatives not yet arrived, will wait 3 seconds
-                    print(f"  ⚠️  Empty GetCreativeById detected at {elapsed:.1f}s")
-                    print(f"  ⚠️  Waiting {SEARCH_CREATIVES_WAIT}s for SearchCreatives to arrive...")
+                    log_buf.append(f"  ⚠️  Empty GetCreativeById detected at {elapsed:.1f}s")
+                    log_buf.append(f"  ⚠️  Waiting {SEARCH_CREATIVES_WAIT}s for SearchCreatives to arrive...")
         
         # Check if 3 seconds passed since empty GetCreativeById detection
         if empty_get_creative_detected and empty_get_creative_detection_time is not None:
             if elapsed >= empty_get_creative_detection_time + SEARCH_CREATIVES_WAIT:
                 # 3 seconds passed, check again
-                has_search_creatives = any(API_SEARCH_CREATIVES in resp.get('url', '') for resp in tracker.api_responses)
-                
-                if has_search_creatives:
-                    creative_in_search = check_creative_in_search_creatives(tracker.api_responses, page_url)
+                if tracker.search_creatives_count > 0:
+                    creative_in_search = check_creative_in_search_creatives(search_creatives_responses, page_url)
                     if not creative_in_search:
-                        print(f"  ⚠️  Creative not in SearchCreatives after 3s wait")
-                        print(f"  ⚠️  Creative not found - exiting wait early at {elapsed:.1f}s")
+                        log_buf.append(f"  ⚠️  Creative not in SearchCreatives after 3s wait")
+                        log_buf.append(f"  ⚠️  Creative not found - exiting wait early at {elapsed:.1f}s")
                         break
                 else:
-                    print(f"  ⚠️  SearchCreatives not arrived after 3s wait")
-                    print(f"  ⚠️  Creative likely not found - exiting wait early at {elapsed:.1f}s")
+                    log_buf.append(f"  ⚠️  SearchCreatives not arrived after 3s wait")
+                    log_buf.append(f"  ⚠️  Creative likely not found - exiting wait early at {elapsed:.1f}s")
                     break
         
         # Step 1: Monitor API responses for new data
-        # When new API responses arrive, extract expected fletch-render IDs
+        # When a new GetCreativeById response arrives, extract expected fletch-render IDs
         # Priority check: Detect static/cached content first (no dynamic files needed)
-        current_api_count = len(tracker.api_responses)
-        if current_api_count > last_api_count:
+        current_get_creative_count = tracker.get_creative_by_id_count
+        if current_get_creative_count > last_get_creative_count:
             # Priority check: Is this static/cached content?
             # Static image ads and cached HTML ads don't have dynamic content.js
             # If detected, exit immediately (no need to wait for content.js)
-            static_check = check_if_static_cached_creative(tracker.api_responses, page_url)
+            static_check = check_if_static_cached_creative(get_creative_responses, page_url)
             if static_check:
                 if VERBOSE_LOGGING:
-                    print(f"\n✅ Static/cached content detected in API response!")
+                    log_buf.append(f"\n✅ Static/cached content detected in API response!")
                     content_type = static_check.get('content_type', 'unknown')
                     ad_type = 'image' if content_type == 'image' else 'HTML text' if content_type == 'html' else 'cached'
-                    print(f"   Type: {ad_type} ad")
-                    print(f"   Creative ID: {static_check['creative_id']}")
-                    print(f"   No dynamic content.js needed - exiting wait early")
+                    log_buf.append(f"   Type: {ad_type} ad")
+                    log_buf.append(f"   Creative ID: {static_check['creative_id']}")
+                    log_buf.append(f"   No dynamic content.js needed - exiting wait early")
                 static_content_detected = static_check
                 break
             
             # Extract expected fletch-render IDs from GetCreativeById API response
             # These IDs tell us which content.js files to expect
-            # Update expectations when new API data arrives
+            # Update expectations when a new GetCreativeById response arrives
             new_expected = extract_expected_fletch_renders_from_api(
-                tracker.api_responses, 
+                get_creative_responses,
                 page_url
             )
             
@@ -248,11 +288,11 @@ async def _smart_wait_for_content(
                 expected_fletch_renders = new_expected
                 
                 if old_count == 0:
-                    print(f"  Expecting {len(expected_fletch_renders)} content.js with specific fletch-render IDs")
+                    log_buf.append(f"  Expecting {len(expected_fletch_renders)} content.js with specific fletch-render IDs")
                 else:
-                    print(f"  Updated expectations: now expecting {len(expected_fletch_renders)} content.js (was {old_count})")
+                    log_buf.append(f"  Updated expectations: now expecting {len(expected_fletch_renders)} content.js (was {old_count})")
             
-            last_api_count = current_api_count
+            last_get_creative_count = current_get_creative_count
         
         # Step 2: Match received content.js files against expected fletch-render IDs
         # Extract fletch-render ID from each content.js URL
@@ -262,28 +302,31 @@ async def _smart_wait_for_content(
             # Check all received content.js responses for matching fletch-render IDs
             new_found_fletch_renders = set()
             for url, text in content_js_responses:
-                fr_match = re.search(PATTERN_FLETCH_RENDER_ID, url)
+                fr_match = _FLETCH_RENDER_ID_RE.search(url)
                 if fr_match:
                     fr_id = fr_match.group(1)
                     if fr_id in expected_fletch_renders:
                         new_found_fletch_renders.add(fr_id)
             
-            # Report newly found fletch-renders
-            newly_found = new_found_fletch_renders - found_fletch_renders
-            if newly_found:
-                for fr_id in newly_found:
-                    print(f"  ✓ Got content.js {len(new_found_fletch_renders)}/{len(expected_fletch_renders)} after {elapsed:.1f}s")
+            # Report progress once per tick (not once per newly found file)
+            if new_found_fletch_renders - found_fletch_renders:
+                log_buf.append(f"  ✓ Got content.js {len(new_found_fletch_renders)}/{len(expected_fletch_renders)} after {elapsed:.1f}s")
             
             found_fletch_renders = new_found_fletch_renders
             
             # Got all expected content.js! Stop waiting
             if len(found_fletch_renders) == len(expected_fletch_renders):
-                print(f"  ✅ Got ALL {len(expected_fletch_renders)} expected content.js responses in {elapsed:.1f}s!")
-                sys.stdout.flush()
+                log_buf.append(f"  ✅ Got ALL {len(expected_fletch_renders)} expected content.js responses in {elapsed:.1f}s!")
                 break
         
-        await page.wait_for_timeout(int(CONTENT_CHECK_INTERVAL * 1000))
-        elapsed += CONTENT_CHECK_INTERVAL
+        _flush_log_buffer(log_buf)
+        # Local pacing sleep: Playwright delivers response events on its own,
+        # so there is no need to round-trip a timer through the browser
+        await asyncio.sleep(CONTENT_CHECK_INTERVAL)
+        elapsed = loop.time() - start
+    
+    # Flush messages from the tick that exited the loop
+    _flush_log_buffer(log_buf)
     
     # Validate wait results
     if len(content_js_responses) == 0:
@@ -299,6 +342,7 @@ async def _smart_wait_for_content(
         critical_errors.append(f"INCOMPLETE: Only got {len(found_fletch_renders)}/{len(expected_fletch_renders)} expected content.js")
     elif not expected_fletch_renders:
         print(f"  ℹ️  No fletch-render IDs from API, will use creative ID matching")
+    sys.stdout.flush()  # Single flush at exit for concurrent environments
     
     return {
         'elapsed': elapsed,
@@ -419,7 +463,7 @@ def _extract_data(
             - 'videos_by_request': List of dicts with 'url' and 'videos' per content.js
             - 'app_store_id': App Store ID string (9-10 digits) or None
             - 'play_store_id': Play Store package ID string (e.g., 'com.example.app') or None
-            - 'app_ids_from_base64': List of app IDs (10-13 digits) extracted from base64
+            - 'app_ids_from_base64': Sorted list of unique app IDs (10-13 digits) extracted from base64
             - 'extraction_method': Method used ('fletch-render', 'static-content', 'none')
             - 'all_videos': List of all videos before deduplication (for statistics)
     
@@ -457,6 +501,7 @@ def _extract_data(
     print("="*80)
     
     all_videos = []
+    unique_video_set = set()  # Running accumulator of unique video IDs
     videos_by_request = []
     app_store_id = None
     play_store_id = None
@@ -482,7 +527,7 @@ def _extract_data(
         # Only process files whose fletch-render ID matches our expected set
         # This ensures we extract data from the correct creative's content
         for url, text in content_js_responses:
-            fr_match = re.search(PATTERN_FLETCH_RENDER_ID, url)
+            fr_match = _FLETCH_RENDER_ID_RE.search(url)
             if fr_match and fr_match.group(1) in found_fletch_renders:
                 # This is one of our expected content.js!
                 
@@ -498,16 +543,16 @@ def _extract_data(
                 # Extract YouTube video IDs from content.js text
                 # Uses multiple regex patterns to handle different video ID formats
                 # Deduplicates videos per request to avoid counting duplicates
-                videos = extract_youtube_videos_from_text(text)
+                videos_this = set(extract_youtube_videos_from_text(text))
                 
-                if videos:
+                if videos_this:
                     videos_by_request.append({
                         'url': url,
-                        'url_short': url[:100] + '...' if len(url) > 100 else url,
-                        'videos': list(set(videos))
+                        'videos': list(videos_this)
                     })
-                    all_videos.extend(videos)
-                    print(f"  Found {len(set(videos))} video(s) in fletch-render-{fr_match.group(1)[:15]}...")
+                    all_videos.extend(videos_this)
+                    unique_video_set.update(videos_this)
+                    print(f"  Found {len(videos_this)} video(s) in fletch-render-{fr_match.group(1)[:15]}...")
                 
                 # Extract App Store ID if not already found
                 # Only need one App Store ID per creative (first match wins)
@@ -547,8 +592,8 @@ def _extract_data(
                         # Silent fail - don't break scraping if base64 extraction has issues
                         pass
         
-        # Deduplicate videos
-        unique_videos = list(set(all_videos))
+        # Videos were deduplicated as they were collected
+        unique_videos = list(unique_video_set)
         
         print(f"\n✅ Total unique videos extracted: {len(unique_videos)}")
         for vid in unique_videos:
@@ -570,10 +615,14 @@ def _extract_data(
     else:
         print("\n⚠️  No Play Store ID found")
     
+    # Sort base64-extracted app IDs once here; consumers (print_results, DB
+    # writers) receive them deduplicated and ordered
+    app_ids_from_base64 = sorted(app_ids_from_base64)
+    
     # Display base64-extracted app IDs
     if app_ids_from_base64:
         print(f"\n✅ App IDs from base64: {len(app_ids_from_base64)} found")
-        for app_id in sorted(app_ids_from_base64):
+        for app_id in app_ids_from_base64:
             print(f"   • {app_id}")
     
     return {
@@ -581,8 +630,65 @@ def _extract_data(
         'videos_by_request': videos_by_request,
         'app_store_id': app_store_id,
         'play_store_id': play_store_id,
-        'app_ids_from_base64': list(app_ids_from_base64),  # Convert set to list for JSON serialization
+        'app_ids_from_base64': app_ids_from_base64,  # Sorted list (JSON serializable)
         'extraction_method': extraction_method,
         'all_videos': all_videos
     }
 
+
+async def _identify_and_extract(
+    tracker: 'TrafficTracker',
+    page_url: str,
+    static_content_info: Optional[Dict[str, Any]],
+    content_js_responses: List[Tuple[str, str]],
+    found_fletch_renders: Set[str],
+    debug_fletch: bool,
+    debug_appstore: bool
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Run creative identification and data extraction in a worker thread.
+    
+    Both stages are pure-Python CPU work, so running them in separate threads
+    would not overlap under the GIL and would interleave their console output.
+    Instead they run back-to-back in a single executor job, which keeps the
+    event loop free while preserving the stage order and output.
+    
+    Note:
+        The stages print as they go, so with several scrapes on one loop their
+        output would land between other scrapes' lines. Such callers should
+        call _identify_creative() and _extract_data() directly.
+    
+    Args:
+        tracker: TrafficTracker instance with captured API responses.
+        page_url: Target URL containing the CR-prefixed creative ID.
+        static_content_info: Static content detection results, or None.
+        content_js_responses: List of (url, text) tuples for captured content.js files.
+        found_fletch_renders: Set of fletch-render IDs that were matched.
+        debug_fletch: If True, save debug files for each fletch-render content.js.
+        debug_appstore: If True, save debug files when App Store ID is found.
+    
+    Returns:
+        Tuple of (creative_results, extraction_results) as returned by
+        _identify_creative() and _extract_data() respectively.
+    
+    Example:
+        creative_results, extraction_results = await _identify_and_extract(
+            tracker, page_url, static_content_info,
+            content_js_responses, found_fletch_renders,
+            debug_fletch=False, debug_appstore=False
+        )
+    """
+    def run_stages() -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        creative_results = _identify_creative(tracker, page_url, static_content_info)
+        extraction_results = _extract_data(
+            content_js_responses,
+            found_fletch_renders,
+            static_content_info,
+            creative_results['real_creative_id'],
+            debug_fletch,
+            debug_appstore
+        )
+        return creative_results, extraction_results
+    
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, run_stages)
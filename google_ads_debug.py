@@ -12,12 +12,22 @@ The module includes:
 - save_fletch_render_debug_file(): Saves fletch-render content.js debug files
 - save_all_content_js_debug_files(): Saves all content.js responses (batch)
 - save_api_response_debug_file(): Saves API response debug files
+
+Debug files are written by a background writer thread so that saving large
+content.js / API payloads never blocks the scraper's event loop.
 """
 
 import os
 import re
-import datetime
-from typing import Dict, Any, Optional, List, Tuple
+import atexit
+import functools
+import io
+import string
+import tarfile
+import queue
+import threading
+import time
+from typing import Dict, Any, Optional, List, Sequence, Tuple
 
 from google_ads_config import PATTERN_CREATIVE_ID_FROM_URL
 
@@ -39,13 +49,272 @@ from google_ads_config import PATTERN_CREATIVE_ID_FROM_URL
 # All debug files are saved to the debug/ folder with consistent formatting.
 # ============================================================================
 
+def _read_debug_max_bytes() -> int:
+    """Parse the DEBUG_MAX_BYTES environment variable (0 or invalid = no cap)."""
+    try:
+        return max(0, int(os.environ.get('DEBUG_MAX_BYTES', '0') or 0))
+    except ValueError:
+        return 0
+
+
+# Optional cap on the content section of each debug file, read once at import
+# from the DEBUG_MAX_BYTES environment variable. 0 (the default) keeps the full
+# content; a positive value truncates larger content and appends a marker.
+# Measured in characters of the decoded text (equal to bytes for ASCII JS/JSON).
+DEBUG_MAX_BYTES = _read_debug_max_bytes()
+
+
+def _truncate_debug_content(content: str) -> str:
+    """
+    Apply the DEBUG_MAX_BYTES cap to debug file content.
+    
+    Args:
+        content: Full content text
+    
+    Returns:
+        content unchanged when no cap is set or it fits, otherwise the first
+        DEBUG_MAX_BYTES characters followed by a truncation marker
+    """
+    limit = DEBUG_MAX_BYTES
+    if not limit or len(content) <= limit:
+        return content
+    return f"{content[:limit]}\n... [TRUNCATED {len(content) - limit} bytes]\n"
+
+
+# Compiled once; used for every content.js URL in save_all_content_js_debug_files()
+_RE_CREATIVE_ID_FROM_URL = re.compile(PATTERN_CREATIVE_ID_FROM_URL)
+
+# Separator line used in debug file headers/footers
+_BAR = "=" * 80
+
+# Footer appended after the content section of every debug file
+# (pre-encoded once, files are written in binary mode)
+_FOOTER_BYTES = f"\n\n{_BAR}\nEND OF DEBUG FILE\n{_BAR}\n".encode('utf-8')
+
+@functools.lru_cache(maxsize=4)
+def _format_second(sec: int, for_filename: bool) -> str:
+    """
+    Format the seconds-resolution part of a debug timestamp.
+    
+    Debug files saved together (e.g. one content.js archive per capture) fall
+    in the same wall-clock second, so localtime() and the date/time formatting
+    run once per second and style; only the microsecond tail changes per call.
+    
+    Args:
+        sec: Seconds since the epoch
+        for_filename: True for 'YYYYMMDD_HHMMSS', False for
+                      'YYYY-MM-DD HH:MM:SS'
+    
+    Returns:
+        Formatted date and time in local time, without the fraction
+    """
+    tm = time.localtime(sec)
+    if for_filename:
+        return (
+            f"{tm.tm_year:04d}{tm.tm_mon:02d}{tm.tm_mday:02d}_"
+            f"{tm.tm_hour:02d}{tm.tm_min:02d}{tm.tm_sec:02d}"
+        )
+    return (
+        f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d} "
+        f"{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
+    )
+
+
+def _format_timestamp(ns: int, for_filename: bool) -> str:
+    """
+    Format a time.time_ns() value in local time without building a datetime.
+    
+    Args:
+        ns: Nanoseconds since the epoch (from time.time_ns())
+        for_filename: True for 'YYYYMMDD_HHMMSS_ffffff' (filename-safe),
+                      False for 'YYYY-MM-DD HH:MM:SS.ffffff' (header)
+    
+    Returns:
+        Formatted timestamp string, identical to the equivalent
+        datetime.now().strftime(...) output
+    """
+    micros = (ns // 1000) % 1_000_000
+    prefix = _format_second(ns // 1_000_000_000, for_filename)
+    if for_filename:
+        return f"{prefix}_{micros:06d}"
+    return f"{prefix}.{micros:06d}"
+
 
+def _get_debug_dir() -> str:
+    """Return the debug/ folder path in the current working directory."""
+    return os.path.join(os.getcwd(), 'debug')
+
+
+def _make_debug_dir(debug_dir: str) -> None:
+    """
+    Create the debug/ folder if it does not exist.
+    
+    A single mkdir() call (the parent is the working directory the path was
+    built from) instead of os.makedirs(), which stats each path component first.
+    """
+    try:
+        os.mkdir(debug_dir)
+    except FileExistsError:
+        pass
+
+
+class _DebugWriter:
+    """
+    Background writer that moves debug file I/O off the caller's thread.
+    
+    save_debug_file() only formats the payload and submits it here; a single
+    daemon thread drains the queue and performs the open/write/close. The
+    debug/ folder is not checked before each write: it is created (and the
+    write retried once) only when a write fails because it is missing.
+    
+    The queue is flushed at interpreter exit (registered with atexit), so all
+    submitted files are on disk before the process terminates.
+    """
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+    
+    def _ensure_thread(self) -> None:
+        """Start the writer thread on first use."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="debug-file-writer",
+                    daemon=True
+                )
+                self._thread.start()
+    
+    def submit(
+        self,
+        filepath: str,
+        parts: Tuple[Any, ...],
+        success_message: Optional[str] = None,
+        print_errors: bool = True
+    ) -> None:
+        """
+        Queue a debug file for writing.
+        
+        Args:
+            filepath: Absolute path of the file to write
+            parts: File content as consecutive str/bytes chunks (written in
+                   order, never joined; str chunks are UTF-8 encoded here)
+            success_message: Message printed once the file is written (None = silent)
+            print_errors: Whether to print a warning if the write fails
+        """
+        self._ensure_thread()
+        self._queue.put((self._write_file, filepath, parts, success_message, print_errors))
+    
+    def submit_archive(
+        self,
+        filepath: str,
+        members: List[Tuple[str, Tuple[Any, ...]]],
+        success_message: Optional[str] = None,
+        print_errors: bool = True
+    ) -> None:
+        """
+        Queue several debug files for writing into a single tar archive.
+        
+        Args:
+            filepath: Absolute path of the .tar file to write
+            members: List of (member filename, parts) tuples; parts as in submit()
+            success_message: Message printed once the archive is written (None = silent)
+            print_errors: Whether to print a warning if the write fails
+        """
+        self._ensure_thread()
+        self._queue.put((self._write_archive, filepath, members, success_message, print_errors))
+    
+    def flush(self) -> None:
+        """Block until every submitted debug file has been written."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+    
+    @staticmethod
+    def _encode_parts(parts: Tuple[Any, ...]):
+        for part in parts:
+            yield part.encode('utf-8') if isinstance(part, str) else part
+    
+    @classmethod
+    def _write_file(cls, filepath: str, parts: Tuple[Any, ...]) -> None:
+        with open(filepath, 'wb') as f:
+            for chunk in cls._encode_parts(parts):
+                f.write(chunk)
+    
+    @classmethod
+    def _write_archive(cls, filepath: str, members: List[Tuple[str, Tuple[Any, ...]]]) -> None:
+        mtime = time.time()
+        with tarfile.open(filepath, 'w') as tar:
+            for name, parts in members:
+                payload = b"".join(cls._encode_parts(parts))
+                info = tarfile.TarInfo(name=name)
+                info.size = len(payload)
+                info.mtime = mtime
+                tar.addfile(info, io.BytesIO(payload))
+    
+    def _run(self) -> None:
+        while True:
+            write, filepath, payload, success_message, print_errors = self._queue.get()
+            try:
+                try:
+                    write(filepath, payload)
+                except FileNotFoundError:
+                    # debug/ not created yet, or removed since: create and retry
+                    _make_debug_dir(os.path.dirname(filepath))
+                    write(filepath, payload)
+                if success_message:
+                    print(success_message)
+            except Exception as e:
+                if print_errors:
+                    print(f"  ⚠️  Failed to save debug file: {e}")
+            finally:
+                self._queue.task_done()
+
+
+_debug_writer = _DebugWriter()
+atexit.register(_debug_writer.flush)
+
+
+def flush_debug_files() -> None:
+    """
+    Wait until all queued debug files have been written to disk.
+    
+    Debug files are written asynchronously; call this when the files must be
+    present before continuing (e.g. before inspecting the debug/ folder).
+    """
+    _debug_writer.flush()
+
+
+# Characters kept as-is by sanitize_filename_part()
+_SAFE_FILENAME_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+
+
+class _FilenameCharTable(dict):
+    """
+    str.translate() table mapping every unsafe character to '_'.
+    
+    Entries are filled lazily (via __missing__) so arbitrary Unicode input is
+    handled, matching the previous re.sub(r'[^a-zA-Z0-9_-]', '_', ...).
+    """
+    
+    def __missing__(self, codepoint: int):
+        mapped = codepoint if chr(codepoint) in _SAFE_FILENAME_CHARS else '_'
+        self[codepoint] = mapped
+        return mapped
+
+
+_FILENAME_CHAR_TABLE = _FilenameCharTable()
+
+
+@functools.lru_cache(maxsize=2048)
 def sanitize_filename_part(part: str) -> str:
     """
     Sanitize a filename part by replacing unsafe characters with underscores.
     
     Keeps only alphanumeric characters, dashes, and underscores.
     All other characters are replaced with underscores.
+    Results are memoized since the same IDs/method names repeat across a run.
     
     Args:
         part: The filename part to sanitize
@@ -53,13 +322,29 @@ def sanitize_filename_part(part: str) -> str:
     Returns:
         Sanitized string safe for use in filenames
     """
-    return re.sub(r'[^a-zA-Z0-9_-]', '_', str(part))
+    return str(part).translate(_FILENAME_CHAR_TABLE)
+
+
+def _build_debug_header(
+    file_type: str,
+    timestamp: str,
+    header_lines: Sequence[str],
+    content_title: str
+) -> str:
+    """Format everything in a debug file that precedes the content section."""
+    header_block = "".join([line + "\n" for line in header_lines])
+    return (
+        f"{_BAR}\n{file_type}\n{_BAR}\n"
+        f"Timestamp: {timestamp}\n"
+        f"{header_block}\n"
+        f"{_BAR}\n{content_title}:\n{_BAR}\n"
+    )
 
 
 def save_debug_file(
     file_type: str,
     filename: str,
-    header_sections: Dict[str, Any],
+    header_lines: Sequence[str],
     content: str,
     success_message: Optional[str] = None,
     print_success: bool = True,
@@ -70,17 +355,23 @@ def save_debug_file(
     
     This function consolidates all common debug file saving logic including
     directory creation, timestamp generation, file writing, and error handling.
+    The formatted file is queued on the background writer and written off the
+    calling thread; use flush_debug_files() to wait for pending writes.
     
     Args:
         file_type: String identifier for the debug file type (e.g., "APPSTORE", "API")
         filename: Complete filename to use (without path)
-        header_sections: Dictionary containing metadata key-value pairs for the header
-                        (e.g., {"App Store ID": "123456", "Method": "fletch-render"})
+        header_lines: Pre-formatted "Key: value" metadata lines for the header
+                      (e.g., ("App Store ID: 123456", "Method: fletch-render"))
         content: The main content text to save in the file
         success_message: Optional custom success message to print (if None, use default)
         print_success: Boolean flag to control whether to print success/error messages
         content_title: Optional title for the content section (default: "CONTENT")
     
+    When the DEBUG_MAX_BYTES environment variable is set to a positive value,
+    content longer than that is truncated and a "[TRUNCATED N bytes]" marker
+    is appended; header metadata (e.g. reported sizes) is left untouched.
+    
     Returns:
         None
     
@@ -88,63 +379,36 @@ def save_debug_file(
         save_debug_file(
             file_type="API RESPONSE DEBUG",
             filename="api_GetCreativeById_1_20250101_120000.txt",
-            header_sections={"API Type": "GetCreativeById", "Index": "1"},
+            header_lines=("API Type: GetCreativeById", "Index: 1"),
             content="<response text>",
             success_message="API debug file saved",
             content_title="API RESPONSE TEXT (Full)"
         )
     """
-    import datetime
-    
     # Coerce content to string to avoid NoneType issues
     content = "" if content is None else str(content)
+    content = _truncate_debug_content(content)
     
-    # Guard against None for header_sections
-    if header_sections is None:
-        header_sections = {}
-    
-    # Create debug directory if it doesn't exist
-    debug_dir = os.path.join(os.getcwd(), 'debug')
-    os.makedirs(debug_dir, exist_ok=True)
+    # Guard against None for header_lines
+    if header_lines is None:
+        header_lines = ()
     
     # Generate timestamp for header
-    timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+    timestamp = _format_timestamp(time.time_ns(), for_filename=False)
     
     # Build filepath
-    filepath = os.path.join(debug_dir, filename)
-    
-    # Format debug content with header
-    debug_content = "=" * 80 + "\n"
-    debug_content += f"{file_type}\n"
-    debug_content += "=" * 80 + "\n"
-    debug_content += f"Timestamp: {timestamp}\n"
-    
-    # Add all header sections
-    for key, value in header_sections.items():
-        debug_content += f"{key}: {value}\n"
-    
-    debug_content += "\n"
-    debug_content += "=" * 80 + "\n"
-    debug_content += f"{content_title}:\n"
-    debug_content += "=" * 80 + "\n"
-    debug_content += content + "\n"
-    debug_content += "\n"
-    debug_content += "=" * 80 + "\n"
-    debug_content += "END OF DEBUG FILE\n"
-    debug_content += "=" * 80 + "\n"
-    
-    # Write to file with error handling
-    try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(debug_content)
-        if print_success:
-            if success_message:
-                print(success_message)
-            else:
-                print(f"  💾 Debug file saved: {filename}")
-    except Exception as e:
-        if print_success:
-            print(f"  ⚠️  Failed to save debug file: {e}")
+    filepath = os.path.join(_get_debug_dir(), filename)
+    
+    # Format header; content is written between header and footer as-is so
+    # large content.js/API bodies are never copied into a combined string
+    header = _build_debug_header(file_type, timestamp, header_lines, content_title)
+    
+    # Hand off to the background writer (creates debug/ on first write)
+    if print_success:
+        message = success_message or f"  💾 Debug file saved: {filename}"
+    else:
+        message = None
+    _debug_writer.submit(filepath, (header, content, _FOOTER_BYTES), message, print_errors=print_success)
 
 
 def save_appstore_debug_file(
@@ -166,29 +430,27 @@ def save_appstore_debug_file(
         creative_id: The creative ID or fletch-render ID
         pattern_description: Description of the regex pattern that matched (optional)
     """
-    import datetime
-    
     # Build filename with timestamp
-    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    timestamp = _format_timestamp(time.time_ns(), for_filename=True)
     filename = f"appstore_{sanitize_filename_part(app_store_id)}_{sanitize_filename_part(method)}_{timestamp}.txt"
     
-    # Build header sections dictionary
-    header_sections = {
-        "App Store ID": app_store_id,
-        "Extraction Method": method,
-        "Creative/Fletch ID": creative_id
-    }
+    # Build header lines
+    header_lines = [
+        f"App Store ID: {app_store_id}",
+        f"Extraction Method: {method}",
+        f"Creative/Fletch ID: {creative_id}"
+    ]
     
     if pattern_description:
-        header_sections["Regex Pattern Used"] = pattern_description
+        header_lines.append(f"Regex Pattern Used: {pattern_description}")
     
-    header_sections["Content.js URL"] = url
+    header_lines.append(f"Content.js URL: {url}")
     
     # Call generic function
     save_debug_file(
         file_type="APP STORE ID DEBUG EXTRACTION",
         filename=filename,
-        header_sections=header_sections,
+        header_lines=header_lines,
         content=text,
         success_message=f"  💾 Debug file saved: {filename}",
         content_title="CONTENT.JS TEXT (Full)"
@@ -210,27 +472,25 @@ def save_fletch_render_debug_file(
         url: The content.js URL
         creative_id: The creative ID
     """
-    import datetime
-    
     # Build filename with timestamp
-    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    timestamp = _format_timestamp(time.time_ns(), for_filename=True)
     # Truncate fletch_render_id for filename (first 15 chars)
     fletch_short = fletch_render_id[:15] if len(fletch_render_id) > 15 else fletch_render_id
     filename = f"fletch_{sanitize_filename_part(fletch_short)}_{timestamp}.txt"
     
-    # Build header sections dictionary
-    header_sections = {
-        "Fletch-Render ID": fletch_render_id,
-        "Creative ID": creative_id,
-        "Content.js URL": url,
-        "Content.js Size": f"{len(text)} bytes"
-    }
+    # Build header lines
+    header_lines = (
+        f"Fletch-Render ID: {fletch_render_id}",
+        f"Creative ID: {creative_id}",
+        f"Content.js URL: {url}",
+        f"Content.js Size: {len(text)} bytes"
+    )
     
     # Call generic function
     save_debug_file(
         file_type="FLETCH-RENDER CONTENT.JS DEBUG",
         filename=filename,
-        header_sections=header_sections,
+        header_lines=header_lines,
         content=text,
         success_message=f"  💾 Fletch debug file saved: {filename}",
         content_title="CONTENT.JS TEXT (Full)"
@@ -245,47 +505,64 @@ def save_all_content_js_debug_files(
     """
     Save ALL content.js responses to debug folder (enhanced debug-content mode).
     
+    All files are written into a single tar archive
+    (debug/all_content_<timestamp>.tar) instead of one file per response,
+    so a capture of N content.js files costs one file creation instead of N.
+    Member names and contents are identical to the former individual files;
+    extract with: tar -xf debug/all_content_<timestamp>.tar -C debug/
+    
+    Each member's content is subject to the DEBUG_MAX_BYTES cap (see
+    save_debug_file()); the header still reports the full content.js size.
+    
     Args:
         content_js_responses: List of (url, text) tuples
     """
-    import datetime
+    total_files = len(content_js_responses)
+    if total_files == 0:
+        return
     
-    # Pre-create debug directory once before looping
-    debug_dir = os.path.join(os.getcwd(), 'debug')
-    os.makedirs(debug_dir, exist_ok=True)
+    run_timestamp = _format_timestamp(time.time_ns(), for_filename=True)
+    members = []
     
     # Loop through content_js_responses
     for idx, (url, text) in enumerate(content_js_responses, 1):
+        text = "" if text is None else text
+        
         # Extract creative ID from URL
         creative_id = 'unknown'
-        match = re.search(PATTERN_CREATIVE_ID_FROM_URL, url)
+        match = _RE_CREATIVE_ID_FROM_URL.search(url)
         if match:
             creative_id = match.group(1)
         
-        # Build filename with timestamp
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        filename = f"all_content_{sanitize_filename_part(creative_id)}_{idx}_{timestamp}.txt"
+        # Build member filename with timestamp
+        timestamp_ns = time.time_ns()
+        filename = (
+            f"all_content_{sanitize_filename_part(creative_id)}_{idx}_"
+            f"{_format_timestamp(timestamp_ns, for_filename=True)}.txt"
+        )
         
-        # Build header sections dictionary
-        header_sections = {
-            "Creative ID": creative_id,
-            "File Index": f"{idx} of {len(content_js_responses)}",
-            "Content.js URL": url,
-            "Content.js Size": f"{len(text)} bytes"
-        }
+        # Build header lines
+        header_lines = (
+            f"Creative ID: {creative_id}",
+            f"File Index: {idx} of {total_files}",
+            f"Content.js URL: {url}",
+            f"Content.js Size: {len(text)} bytes"
+        )
         
-        # Call generic function with error handling
-        try:
-            save_debug_file(
-                file_type="ALL CONTENT.JS DEBUG (COMPLETE CAPTURE)",
-                filename=filename,
-                header_sections=header_sections,
-                content=text,
-                print_success=False,
-                content_title="CONTENT.JS TEXT (Full)"
-            )
-        except Exception as e:
-            print(f"  ⚠️  Failed to save all_content debug file {idx}: {e}")
+        header = _build_debug_header(
+            "ALL CONTENT.JS DEBUG (COMPLETE CAPTURE)",
+            _format_timestamp(timestamp_ns, for_filename=False),
+            header_lines,
+            "CONTENT.JS TEXT (Full)"
+        )
+        members.append((filename, (header, _truncate_debug_content(text), _FOOTER_BYTES)))
+    
+    archive_name = f"all_content_{run_timestamp}.tar"
+    _debug_writer.submit_archive(
+        os.path.join(_get_debug_dir(), archive_name),
+        members,
+        success_message=f"  💾 {total_files} content.js debug file(s) archived: {archive_name}"
+    )
 
 
 def save_api_response_debug_file(
@@ -299,8 +576,6 @@ def save_api_response_debug_file(
         api_response: Dict with 'url', 'text', 'type', 'timestamp'
         index: Index number of this API response
     """
-    import datetime
-    
     # Extract data from api_response dict
     api_type = api_response.get('type', 'unknown')
     url = api_response.get('url', 'N/A')
@@ -308,24 +583,24 @@ def save_api_response_debug_file(
     captured_at = api_response.get('timestamp', 'unknown')
     
     # Build filename with timestamp
-    timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    timestamp = _format_timestamp(time.time_ns(), for_filename=True)
     filename = f"api_{sanitize_filename_part(api_type)}_{index}_{timestamp}.txt"
     
-    # Build header sections dictionary
-    header_sections = {
-        "API Type": api_type,
-        "Response Index": index,
-        "Captured At": captured_at,
-        "API URL": url,
-        "Response Size": f"{len(text)} bytes"
-    }
+    # Build header lines
+    header_lines = (
+        f"API Type: {api_type}",
+        f"Response Index: {index}",
+        f"Captured At: {captured_at}",
+        f"API URL: {url}",
+        f"Response Size: {len(text)} bytes"
+    )
     
     # Call generic function with error handling
     try:
         save_debug_file(
             file_type="API RESPONSE DEBUG",
             filename=filename,
-            header_sections=header_sections,
+            header_lines=header_lines,
             content=text,
             print_success=False,
             content_title="API RESPONSE TEXT (Full)"
@@ -12,7 +12,14 @@ Functions:
 """
 
 import re
-from typing import List, Optional, Tuple
+from typing import Any, List, Optional, Tuple, Pattern
+
+# Import hyperscan for multi-pattern SIMD scanning (optional)
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
 
 from google_ads_config import (
     PATTERN_YOUTUBE_THUMBNAIL,
@@ -28,6 +35,174 @@ from google_ads_config import (
 )
 
 
+# ============================================================================
+# PRIORITY PATTERN SCANNING
+# ============================================================================
+
+def _search_by_priority(
+    regexes: List[Pattern],
+    text: str,
+    descriptions: List[str]
+) -> Optional[Tuple[str, str]]:
+    """
+    Search precompiled patterns in priority order and return the first match.
+    
+    Each pattern is searched on its own so re can use its literal-prefix
+    fast scan; the first pattern that matches anywhere in the text wins.
+    
+    Args:
+        regexes: Compiled patterns in priority order, each with one capture group.
+        text: Text content to search.
+        descriptions: Pattern descriptions in the same priority order.
+    
+    Returns:
+        tuple or None: (captured_value, pattern_description) if any pattern matched
+    """
+    for regex, description in zip(regexes, descriptions):
+        match = regex.search(text)
+        if match:
+            return (match.group(1), description)
+    return None
+
+
+def _compile_hyperscan_database(patterns: List[Tuple[str, bool]]) -> Optional[Any]:
+    """
+    Compile priority patterns into a single Hyperscan database.
+    
+    Hyperscan matches all patterns in one SIMD-accelerated pass but cannot
+    report capture groups, so the database is only used to find which pattern
+    (by priority index) matches; the value is then captured with re.
+    
+    Args:
+        patterns: List of (pattern, ignore_case) tuples in priority order.
+    
+    Returns:
+        Compiled hyperscan.Database, or None if hyperscan is not installed or
+        rejects a pattern (callers then use the re scanner only).
+    """
+    if not HYPERSCAN_AVAILABLE:
+        return None
+    
+    # UTF8 + UCP give \d, [a-z] and caseless matching the same Unicode
+    # semantics as Python's re on str input
+    base_flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode('utf-8') for pattern, _ in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[
+                base_flags | hyperscan.HS_FLAG_CASELESS if ignore_case else base_flags
+                for _, ignore_case in patterns
+            ]
+        )
+        return database
+    except hyperscan.error:
+        return None
+
+
+def _find_priority_with_hyperscan(database: Any, text: str) -> Tuple[bool, Optional[int]]:
+    """
+    Find the highest-priority pattern that matches anywhere in text.
+    
+    Args:
+        database: Database compiled by _compile_hyperscan_database().
+        text: Text content to search.
+    
+    Returns:
+        (handled, priority): handled is False if the scan could not run
+        (e.g. text is not encodable, or the database scratch space is busy in
+        another thread) and the caller must fall back to the re scanner;
+        priority is the best matching pattern index, or None if none matched.
+    """
+    best = [None]
+    
+    def on_match(pattern_id, start, end, flags, context):
+        if best[0] is None or pattern_id < best[0]:
+            best[0] = pattern_id
+        # Returning True stops the scan: nothing can beat priority 0
+        return pattern_id == 0
+    
+    try:
+        database.scan(text.encode('utf-8'), match_event_handler=on_match)
+    except UnicodeEncodeError:
+        return (False, None)
+    except hyperscan.error:
+        # Scan terminated by on_match (priority 0 found) or scratch in use
+        if best[0] != 0:
+            return (False, None)
+    return (True, best[0])
+
+
+def _extract_by_priority(
+    hyperscan_db: Optional[Any],
+    regexes: List[Pattern],
+    text: str,
+    descriptions: List[str]
+) -> Optional[Tuple[str, str]]:
+    """
+    Return (captured_value, description) for the highest-priority match.
+    
+    Uses the Hyperscan database to pick the winning pattern when available,
+    then captures its value with that pattern's compiled regex; otherwise
+    falls back to searching the regexes in order (_search_by_priority()).
+    """
+    if hyperscan_db is not None:
+        handled, priority = _find_priority_with_hyperscan(hyperscan_db, text)
+        if handled:
+            if priority is None:
+                return None
+            match = regexes[priority].search(text)
+            if match:
+                return (match.group(1), descriptions[priority])
+    return _search_by_priority(regexes, text, descriptions)
+
+
+def _compile_individual_patterns(patterns: List[Tuple[str, bool]]) -> List[Pattern]:
+    """Compile each priority pattern on its own, once at import time."""
+    return [
+        re.compile(pattern, re.IGNORECASE) if ignore_case else re.compile(pattern)
+        for pattern, ignore_case in patterns
+    ]
+
+
+# App Store patterns in priority order (first pattern that matches anywhere wins)
+_APPSTORE_PATTERNS = [
+    (PATTERN_APPSTORE_STANDARD, True),
+    (PATTERN_APPSTORE_ESCAPED, True),
+    (PATTERN_APPSTORE_DIRECT, True),
+    (PATTERN_APPSTORE_JSON, False),
+]
+_APPSTORE_REGEXES = _compile_individual_patterns(_APPSTORE_PATTERNS)
+_APPSTORE_HYPERSCAN_DB = _compile_hyperscan_database(_APPSTORE_PATTERNS)
+_APPSTORE_DESCRIPTIONS = [
+    "Pattern 1: Standard Apple URL (apps.apple.com or itunes.apple.com with optional country code and app name)",
+    "Pattern 2: Escaped Apple URL (URL encoded %2F, hex escaped \\x2F, etc.)",
+    "Pattern 3: Direct app/id pattern (/app/id followed by 9-10 digits)",
+    "Pattern 4: JSON appId field",
+]
+
+# Play Store patterns in priority order (first pattern that matches anywhere wins)
+_PLAYSTORE_PATTERNS = [
+    (PATTERN_PLAYSTORE_STANDARD, True),
+    (PATTERN_PLAYSTORE_ESCAPED, True),
+    (PATTERN_PLAYSTORE_ADURL, True),
+]
+_PLAYSTORE_REGEXES = _compile_individual_patterns(_PLAYSTORE_PATTERNS)
+_PLAYSTORE_HYPERSCAN_DB = _compile_hyperscan_database(_PLAYSTORE_PATTERNS)
+_PLAYSTORE_DESCRIPTIONS = [
+    "Pattern 1: Standard Play Store URL (play.google.com/store/apps/details?id=package.name)",
+    "Pattern 2: Escaped Play Store URL (URL encoded %2F, %3F, %3D, hex escaped \\x2F, etc.)",
+    "Pattern 3: adurl parameter with Play Store URL (adurl=...play.google.com...details?id=package.name)",
+]
+
+# YouTube video ID patterns (compiled once at import time)
+_RE_YT_THUMB = re.compile(PATTERN_YOUTUBE_THUMBNAIL)
+_RE_YT_ID_FIELD = re.compile(PATTERN_YOUTUBE_VIDEO_ID_FIELD)
+_RE_YT_ID_CAMEL = re.compile(PATTERN_YOUTUBE_VIDEO_ID_CAMELCASE)
+
+
 # ============================================================================
 # DATA EXTRACTION
 # ============================================================================
@@ -48,23 +223,20 @@ def extract_youtube_videos_from_text(text: str) -> List[str]:
     Returns:
         list: List of 11-character YouTube video IDs
     """
-    videos = []
+    videos = set()
     
     # Pattern 1: ytimg.com thumbnails
-    pattern = re.compile(PATTERN_YOUTUBE_THUMBNAIL)
-    videos.extend(pattern.findall(text))
+    videos.update(_RE_YT_THUMB.findall(text))
     
     # Pattern 2: video_id field (with regular or escaped quotes)
     # Matches: 'video_id': 'ID', "video_id": "ID", \x27video_id\x27: \x27ID\x27
-    pattern = re.compile(PATTERN_YOUTUBE_VIDEO_ID_FIELD)
-    videos.extend(pattern.findall(text))
+    videos.update(_RE_YT_ID_FIELD.findall(text))
     
     # Pattern 3: video_videoId field (camelCase variant)
     # Matches: 'video_videoId': 'ID', "video_videoId": "ID", \x27video_videoId\x27: \x27ID\x27
-    pattern = re.compile(PATTERN_YOUTUBE_VIDEO_ID_CAMELCASE)
-    videos.extend(pattern.findall(text))
+    videos.update(_RE_YT_ID_CAMEL.findall(text))
     
-    return list(set(videos))
+    return list(videos)
 
 
 def extract_app_store_id_from_text(text: str) -> Optional[Tuple[str, str]]:
@@ -76,37 +248,20 @@ def extract_app_store_id_from_text(text: str) -> Optional[Tuple[str, str]]:
     - https://itunes.apple.com/app/id1234567890
     - Escaped versions with %2F, \\x2F, etc.
     
+    Patterns are tried in priority order (standard, escaped, direct, JSON)
+    and the first one that matches wins. When the optional hyperscan package
+    is installed, one Hyperscan pass picks the winning pattern first.
+    
     Args:
         text: Text content to search
         
     Returns:
         tuple or None: (app_store_id, pattern_description) if found, None otherwise
     """
-    patterns = [
-        (
-            re.compile(PATTERN_APPSTORE_STANDARD, re.IGNORECASE),
-            "Pattern 1: Standard Apple URL (apps.apple.com or itunes.apple.com with optional country code and app name)"
-        ),
-        (
-            re.compile(PATTERN_APPSTORE_ESCAPED, re.IGNORECASE),
-            "Pattern 2: Escaped Apple URL (URL encoded %2F, hex escaped \\x2F, etc.)"
-        ),
-        (
-            re.compile(PATTERN_APPSTORE_DIRECT, re.IGNORECASE),
-            "Pattern 3: Direct app/id pattern (/app/id followed by 9-10 digits)"
-        ),
-        (
-        re.compile(PATTERN_APPSTORE_JSON),
-            "Pattern 4: JSON appId field"
-        ),
-    ]
-    
-    for pattern, description in patterns:
-        match = pattern.search(text)
-        if match:
-            return (match.group(1), description)
-    
-    return None
+    return _extract_by_priority(
+        _APPSTORE_HYPERSCAN_DB, _APPSTORE_REGEXES,
+        text, _APPSTORE_DESCRIPTIONS
+    )
 
 
 def extract_play_store_id_from_text(text: str) -> Optional[Tuple[str, str]]:
@@ -119,31 +274,17 @@ def extract_play_store_id_from_text(text: str) -> Optional[Tuple[str, str]]:
     - JavaScript-escaped versions with \\x2F, \\x3F, \\x3D, etc.
     - adurl parameter format: adurl=https://play.google.com/.../details?id=package.name
     
+    Patterns are tried in priority order (standard, escaped, adurl) and the
+    first one that matches wins.
+    
     Args:
         text: Text content to search
         
     Returns:
         tuple or None: (play_store_id, pattern_description) if found, None otherwise
     """
-    patterns = [
-        (
-            re.compile(PATTERN_PLAYSTORE_STANDARD, re.IGNORECASE),
-            "Pattern 1: Standard Play Store URL (play.google.com/store/apps/details?id=package.name)"
-        ),
-        (
-            re.compile(PATTERN_PLAYSTORE_ESCAPED, re.IGNORECASE),
-            "Pattern 2: Escaped Play Store URL (URL encoded %2F, %3F, %3D, hex escaped \\x2F, etc.)"
-        ),
-        (
-            re.compile(PATTERN_PLAYSTORE_ADURL, re.IGNORECASE),
-            "Pattern 3: adurl parameter with Play Store URL (adurl=...play.google.com...details?id=package.name)"
-        ),
-    ]
-    
-    for pattern, description in patterns:
-        match = pattern.search(text)
-        if match:
-            return (match.group(1), description)
-    
-    return None
+    return _extract_by_priority(
+        _PLAYSTORE_HYPERSCAN_DB, _PLAYSTORE_REGEXES,
+        text, _PLAYSTORE_DESCRIPTIONS
+    )
 
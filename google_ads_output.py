@@ -22,6 +22,7 @@ Usage:
     print_results(result)
 """
 
+import sys
 from typing import Dict, Any
 
 from google_ads_config import BYTE_CONVERSION_FACTOR
@@ -31,6 +32,22 @@ from google_ads_config import BYTE_CONVERSION_FACTOR
 # OUTPUT FORMATTING
 # ============================================================================
 
+# Units indexed by power of BYTE_CONVERSION_FACTOR (1024 = 2**10)
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Section headers and separators for print_results(), formatted once at import
+_SEPARATOR = "=" * 80
+_HDR_EXECUTION_STATUS = f"\n{'EXECUTION STATUS':-^80}"
+_HDR_VIDEOS = f"\n{'VIDEOS':-^80}"
+_HDR_APP_STORE = f"\n{'APP STORE':-^80}"
+_HDR_FUNDED_BY = f"\n{'FUNDED BY':-^80}"
+_HDR_CREATIVE_ID = f"\n{'CREATIVE ID':-^80}"
+_HDR_EXTRACTION_METHOD = f"\n{'EXTRACTION METHOD':-^80}"
+_HDR_TRAFFIC_STATISTICS = f"\n{'TRAFFIC STATISTICS':-^80}"
+_HDR_TRAFFIC_BY_TYPE = f"\n{'Traffic by Type':-^80}"
+_HDR_CACHE_STATISTICS = f"\n{'CACHE STATISTICS':-^80}"
+
+
 def format_bytes(bytes_value: int) -> str:
     """
     Format byte count into human-readable string with appropriate unit.
@@ -56,12 +73,12 @@ def format_bytes(bytes_value: int) -> str:
         Uses binary units (1024 bytes = 1 KB) rather than decimal units
         (1000 bytes = 1 KB) for consistency with system tools.
     """
-    b = bytes_value
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if b < BYTE_CONVERSION_FACTOR:
-            return f"{b:.2f} {unit}"
-        b /= BYTE_CONVERSION_FACTOR
-    return f"{b:.2f} TB"
+    if bytes_value < BYTE_CONVERSION_FACTOR:
+        return f"{bytes_value:.2f} B"
+    # Unit index straight from the bit length (each unit is 10 bits),
+    # instead of dividing in a loop until the value drops below 1024
+    unit_index = min((int(bytes_value).bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / BYTE_CONVERSION_FACTOR ** unit_index:.2f} {_BYTE_UNITS[unit_index]}"
 
 
 def print_results(result: Dict[str, Any]) -> None:
@@ -79,10 +96,13 @@ def print_results(result: Dict[str, Any]) -> None:
     
     Args:
         result: Dictionary returned by scrape_ads_transparency_page() containing
-                all scraping results, statistics, and metadata.
+                all scraping results, statistics, and metadata. Its
+                'incoming_by_type' must already be ordered largest-first
+                (TrafficTracker.get_incoming_by_type_sorted()); it is printed
+                in that order, not re-sorted here.
     
     Returns:
-        None (prints to stdout)
+        None (writes to stdout in a single call)
     
     Example:
         result = await scrape_ads_transparency_page(page_url)
@@ -100,123 +120,134 @@ def print_results(result: Dict[str, Any]) -> None:
         - ⚠️: Warnings
         - 🔬/🔢/🖼️: Identification methods
     """
-    print("\n" + "="*80)
-    print("RESULTS")
-    print("="*80)
+    # Collect all lines and emit them with a single write at the end
+    out = []
+    
+    # Bind values read more than once to locals
+    get = result.get
+    app_store_id = get('app_store_id')
+    incoming_bytes = get('incoming_bytes', 0)
+    incoming_by_type = get('incoming_by_type')
+    is_proxy_measurement = get('measurement_method') == 'proxy'
+    
+    out.append("\n" + _SEPARATOR)
+    out.append("RESULTS")
+    out.append(_SEPARATOR)
     
     # Show execution status first
     # Prefer legacy keys (execution_success, execution_errors, execution_warnings) if present
     # Fall back to new keys (success, errors, warnings) for backward compatibility
-    print(f"\n{'EXECUTION STATUS':-^80}")
-    execution_success = result.get('execution_success', result.get('success', False))
-    execution_errors = result.get('execution_errors', result.get('errors', []))
-    execution_warnings = result.get('execution_warnings', result.get('warnings', []))
+    out.append(_HDR_EXECUTION_STATUS)
+    execution_success = get('execution_success', get('success', False))
+    execution_errors = get('execution_errors', get('errors', []))
+    execution_warnings = get('execution_warnings', get('warnings', []))
     
     if execution_success:
-        print("Status: ✅ SUCCESS")
+        out.append("Status: ✅ SUCCESS")
     else:
-        print("Status: ❌ FAILED")
+        out.append("Status: ❌ FAILED")
         if execution_errors:
-            print(f"Errors: {len(execution_errors)}")
+            out.append(f"Errors: {len(execution_errors)}")
             for err in execution_errors:
-                print(f"  • {err}")
+                out.append(f"  • {err}")
     
     if execution_warnings:
-        print(f"Warnings: {len(execution_warnings)}")
+        out.append(f"Warnings: {len(execution_warnings)}")
         for warn in execution_warnings:
-            print(f"  • {warn}")
-    
-    print(f"\n{'VIDEOS':-^80}")
-    print(f"Videos found: {result.get('video_count', 0)}")
-    for vid in result.get('videos', []):
-        print(f"  • {vid}")
-        print(f"    https://www.youtube.com/watch?v={vid}")
-    
-    print(f"\n{'APP STORE':-^80}")
-    if result.get('app_store_id'):
-        print(f"App Store ID: {result.get('app_store_id')}")
-        print(f"  https://apps.apple.com/app/id{result.get('app_store_id')}")
+            out.append(f"  • {warn}")
+    
+    out.append(_HDR_VIDEOS)
+    out.append(f"Videos found: {get('video_count', 0)}")
+    for vid in get('videos', []):
+        out.append(f"  • {vid}")
+        out.append(f"    https://www.youtube.com/watch?v={vid}")
+    
+    out.append(_HDR_APP_STORE)
+    if app_store_id:
+        out.append(f"App Store ID: {app_store_id}")
+        out.append(f"  https://apps.apple.com/app/id{app_store_id}")
     else:
-        print("No App Store ID found")
+        out.append("No App Store ID found")
     
     # Display base64-extracted app IDs
-    app_ids_base64 = result.get('app_ids_from_base64', [])
+    app_ids_base64 = get('app_ids_from_base64', [])
     if app_ids_base64:
-        print(f"\nApp IDs from base64: {len(app_ids_base64)} found")
-        for app_id in sorted(app_ids_base64):
-            print(f"  • {app_id}")
-            print(f"    https://apps.apple.com/app/id{app_id}")
-    
-    print(f"\n{'FUNDED BY':-^80}")
-    if result.get('funded_by'):
-        print(f"Sponsor: {result['funded_by']}")
+        out.append(f"\nApp IDs from base64: {len(app_ids_base64)} found")
+        # Already deduplicated and sorted by the extractor
+        for app_id in app_ids_base64:
+            out.append(f"  • {app_id}")
+            out.append(f"    https://apps.apple.com/app/id{app_id}")
+    
+    out.append(_HDR_FUNDED_BY)
+    funded_by = get('funded_by')
+    if funded_by:
+        out.append(f"Sponsor: {funded_by}")
     else:
-        print("No sponsor information found")
-    
-    print(f"\n{'CREATIVE ID':-^80}")
-    print(f"Real Creative ID: {result.get('real_creative_id', 'N/A')}")
-    print(f"Method used: {result.get('method_used', 'unknown')}")
-    
-    print(f"\n{'EXTRACTION METHOD':-^80}")
-    extraction_method = result.get('extraction_method', 'unknown')
-    if result.get('is_static_content'):
-        print(f"Method: 🖼️  Static/Cached Content Detected")
-        if result.get('static_content_info'):
-            info = result['static_content_info']
+        out.append("No sponsor information found")
+    
+    out.append(_HDR_CREATIVE_ID)
+    out.append(f"Real Creative ID: {get('real_creative_id', 'N/A')}")
+    out.append(f"Method used: {get('method_used', 'unknown')}")
+    
+    out.append(_HDR_EXTRACTION_METHOD)
+    extraction_method = get('extraction_method', 'unknown')
+    if get('is_static_content'):
+        out.append(f"Method: 🖼️  Static/Cached Content Detected")
+        info = get('static_content_info')
+        if info:
             content_type = info.get('content_type', 'unknown')
-            print(f"  Creative ID: {info.get('creative_id', 'N/A')}")
+            out.append(f"  Creative ID: {info.get('creative_id', 'N/A')}")
             if content_type == 'image':
-                print(f"  Type: Image ad with cached content")
+                out.append(f"  Type: Image ad with cached content")
             elif content_type == 'html':
-                print(f"  Type: HTML text ad with cached content")
+                out.append(f"  Type: HTML text ad with cached content")
             else:
-                print(f"  Type: Cached content")
-            print(f"  Reason: {info.get('reason', 'N/A')}")
+                out.append(f"  Type: Cached content")
+            out.append(f"  Reason: {info.get('reason', 'N/A')}")
     elif extraction_method == 'fletch-render':
-        print(f"Method: 🎯 Fletch-Render IDs (precise API matching)")
-        print(f"  Expected: {result.get('expected_fletch_renders', 0)} content.js")
-        print(f"  Found: {result.get('found_fletch_renders', 0)} content.js")
+        out.append(f"Method: 🎯 Fletch-Render IDs (precise API matching)")
+        out.append(f"  Expected: {get('expected_fletch_renders', 0)} content.js")
+        out.append(f"  Found: {get('found_fletch_renders', 0)} content.js")
     else:
-        print(f"Method: ❌ None available")
-    
-    print(f"\n{'TRAFFIC STATISTICS':-^80}")
-    method_emoji = "🔬" if result.get('measurement_method') == 'proxy' else "📊"
-    method_name = "Real Proxy" if result.get('measurement_method') == 'proxy' else "Estimation"
-    print(f"Measurement: {method_emoji} {method_name}")
-    print(f"Incoming: {format_bytes(result.get('incoming_bytes', 0))}")
-    print(f"Outgoing: {format_bytes(result.get('outgoing_bytes', 0))}")
-    print(f"Total: {format_bytes(result.get('total_bytes', 0))}")
-    print(f"Requests: {result.get('request_count', 0)}")
-    print(f"Blocked: {result.get('url_blocked_count', 0)}")
-    print(f"Duration: {result.get('duration_ms', 0):.0f} ms")
-    
-    if result.get('incoming_by_type'):
-        print(f"\n{'Traffic by Type':-^80}")
-        for resource_type, bytes_count in sorted(
-            result.get('incoming_by_type', {}).items(),
-            key=lambda x: x[1],
-            reverse=True
-        ):
-            pct = (bytes_count / result.get('incoming_bytes', 0) * 100) if result.get('incoming_bytes', 0) > 0 else 0
-            print(f"  {resource_type:<15} {format_bytes(bytes_count):<15} ({pct:.1f}%)")
+        out.append(f"Method: ❌ None available")
+    
+    out.append(_HDR_TRAFFIC_STATISTICS)
+    method_emoji = "🔬" if is_proxy_measurement else "📊"
+    method_name = "Real Proxy" if is_proxy_measurement else "Estimation"
+    out.append(f"Measurement: {method_emoji} {method_name}")
+    out.append(f"Incoming: {format_bytes(incoming_bytes)}")
+    out.append(f"Outgoing: {format_bytes(get('outgoing_bytes', 0))}")
+    out.append(f"Total: {format_bytes(get('total_bytes', 0))}")
+    out.append(f"Requests: {get('request_count', 0)}")
+    out.append(f"Blocked: {get('url_blocked_count', 0)}")
+    out.append(f"Duration: {get('duration_ms', 0):.0f} ms")
+    
+    if incoming_by_type:
+        out.append(_HDR_TRAFFIC_BY_TYPE)
+        # Already ordered largest-first when the result dict was built
+        for resource_type, bytes_count in incoming_by_type.items():
+            pct = (bytes_count / incoming_bytes * 100) if incoming_bytes > 0 else 0
+            out.append(f"  {resource_type:<15} {format_bytes(bytes_count):<15} ({pct:.1f}%)")
     
     # Display cache statistics if any cacheable requests were made
-    cache_total = result.get('cache_total_requests', 0)
+    cache_total = get('cache_total_requests', 0)
     if cache_total > 0:
-        print(f"\n{'CACHE STATISTICS':-^80}")
-        cache_hits = result.get('cache_hits', 0)
-        cache_misses = result.get('cache_misses', 0)
-        cache_hit_rate = result.get('cache_hit_rate', 0)
-        cache_bytes_saved = result.get('cache_bytes_saved', 0)
+        out.append(_HDR_CACHE_STATISTICS)
+        cache_hits = get('cache_hits', 0)
+        cache_misses = get('cache_misses', 0)
+        cache_hit_rate = get('cache_hit_rate', 0)
+        cache_bytes_saved = get('cache_bytes_saved', 0)
         
-        print(f"Cache Hits: {cache_hits}/{cache_total} ({cache_hit_rate:.1f}%)")
-        print(f"Cache Misses: {cache_misses}")
-        print(f"Bandwidth Saved: {format_bytes(cache_bytes_saved)}")
+        out.append(f"Cache Hits: {cache_hits}/{cache_total} ({cache_hit_rate:.1f}%)")
+        out.append(f"Cache Misses: {cache_misses}")
+        out.append(f"Bandwidth Saved: {format_bytes(cache_bytes_saved)}")
         
         if cache_hits > 0:
-            print(f"Status: 💾 Serving main.dart.js from cache (146x faster)")
+            out.append(f"Status: 💾 Serving main.dart.js from cache (146x faster)")
         elif cache_misses > 0:
-            print(f"Status: 🌐 Downloaded main.dart.js (will be cached for next run)")
+            out.append(f"Status: 🌐 Downloaded main.dart.js (will be cached for next run)")
+    
+    out.append("\n" + _SEPARATOR)
     
-    print("\n" + "="*80)
+    sys.stdout.write("\n".join(out) + "\n")
 
@@ -30,17 +30,21 @@ Module Dependencies:
     - Standard Library: asyncio, subprocess, os, time, re, json, collections, typing
     - Optional: fake-useragent (for randomized user agents)
     - Local: google_ads_config (for configuration constants)
+    - Local: google_ads_api_analysis (for decoding captured API responses)
 
 Author: Google Ads Transparency Scraper Team
 """
 
 import asyncio
+import functools
 import subprocess
 import os
 import time
 import re
-from collections import defaultdict
-from typing import Dict, List, Tuple, Optional, Any
+import shutil
+import sys
+from collections import deque
+from typing import Dict, List, NamedTuple, Tuple, Optional, Any
 
 # Import fake-useragent for randomized Chrome user agents
 try:
@@ -53,25 +57,136 @@ except ImportError:
 from google_ads_config import (
     BLOCKED_URL_PATTERNS,
     CONTENT_JS_FILENAME,
-    CONTENT_JS_DOMAIN,
+    CONTENT_JS_URL_PREFIX,
+    MAX_BLOCKED_URLS_TRACKED,
     REQUEST_SIZE_OVERHEAD,
     PATTERN_CREATIVE_ID_FROM_URL,
+    API_GET_CREATIVE_BY_ID,
+    API_SEARCH_CREATIVES,
+    API_GET_ADVERTISER_BY_ID,
     USE_RANDOM_USER_AGENT,
     USER_AGENT,
     MITM_ADDON_PATH,
     PROXY_ADDON_SCRIPT,
     PROXY_RESULTS_PATH,
     MITMDUMP_SEARCH_PATHS,
-    SUBPROCESS_VERSION_CHECK_TIMEOUT,
     MITMPROXY_PORT,
     PROXY_STARTUP_WAIT
 )
 
+# Import API response parsing (decoded once at capture time)
+from google_ads_api_analysis import parse_api_response
+
+
+# Canonical (interned) resource-type strings used as by-type dict keys.
+# Playwright hands out a fresh str per request; mapping it to the shared
+# constant lets dict lookups in outgoing_by_type hit on identity.
+_RESOURCE_TYPE_KEYS = {
+    resource_type: sys.intern(resource_type)
+    for resource_type in (
+        'document', 'stylesheet', 'image', 'media', 'font', 'script',
+        'texttrack', 'xhr', 'fetch', 'eventsource', 'websocket',
+        'manifest', 'other'
+    )
+}
+
+# Categories produced by _classify_content_type (keys of incoming_by_type)
+_CONTENT_TYPE_CATEGORIES = (
+    'image', 'stylesheet', 'script', 'font', 'media', 'document', 'xhr', 'other'
+)
+
+# Compiled once: used by ContentJsRequest.creative_id on content.js URLs
+_CREATIVE_ID_FROM_URL_RE = re.compile(PATTERN_CREATIVE_ID_FROM_URL, re.IGNORECASE)
+
 
 # ============================================================================
 # TRAFFIC TRACKER CLASS
 # ============================================================================
 
+@functools.lru_cache(maxsize=256)
+def _classify_content_type(content_type: str) -> str:
+    """
+    Map a Content-Type header value to a resource type category.
+    
+    A page only produces a handful of distinct Content-Type values, so the
+    substring cascade runs once per value and later responses are a single
+    cache lookup.
+    
+    Args:
+        content_type: Raw Content-Type header value (any case).
+    
+    Returns:
+        'image', 'stylesheet', 'script', 'font', 'media', 'document', 'xhr',
+        or 'other'.
+    """
+    content_type = content_type.lower()
+    
+    if 'image/' in content_type:
+        return 'image'
+    elif 'text/css' in content_type:
+        return 'stylesheet'
+    elif 'javascript' in content_type:
+        return 'script'
+    elif 'font/' in content_type:
+        return 'font'
+    elif 'video/' in content_type or 'audio/' in content_type:
+        return 'media'
+    elif 'text/html' in content_type:
+        return 'document'
+    elif 'application/json' in content_type:
+        return 'xhr'
+    
+    return 'other'
+
+
+def _headers_size(headers: Dict[str, str]) -> int:
+    """
+    Byte size of headers serialized as "key: value\r\n" lines.
+    
+    HTTP header names/values are ASCII in practice, so the size is plain
+    length arithmetic (str.isascii() is O(1) in CPython); only non-ASCII
+    entries are UTF-8 encoded to count their bytes.
+    
+    Args:
+        headers: Header name -> value mapping (Playwright headers dict).
+    
+    Returns:
+        Total bytes, identical to summing len(f"{k}: {v}\r\n".encode()).
+    """
+    size = 4 * len(headers)  # ": " + "\r\n" per header
+    for k, v in headers.items():
+        if k.isascii() and v.isascii():
+            size += len(k) + len(v)
+        else:
+            size += len(k.encode()) + len(v.encode())
+    return size
+
+
+class ContentJsRequest(NamedTuple):
+    """
+    One captured content.js request (entry of TrafficTracker.content_js_requests).
+    
+    A NamedTuple instead of a dict: entries are created for every content.js
+    request of every scrape, and a tuple is a fraction of a dict's size.
+    
+    Attributes:
+        url: The content.js request URL
+        timestamp: Capture time (time.time())
+        text: Response body when already fetched (API-only path), else None
+        creative_id: 12-digit creativeId query parameter, or None (derived
+                     from url on access, so the Playwright callback never runs
+                     the regex for it)
+    """
+    url: str
+    timestamp: float
+    text: Optional[str] = None
+    
+    @property
+    def creative_id(self) -> Optional[str]:
+        match = _CREATIVE_ID_FROM_URL_RE.search(self.url)
+        return match.group(1) if match else None
+
+
 class TrafficTracker:
     """
     Tracks network traffic statistics and provides bandwidth estimation.
@@ -87,11 +202,18 @@ class TrafficTracker:
         request_count (int): Total number of requests made
         blocked_count (int): Number of requests that failed or were blocked
         url_blocked_count (int): Number of URLs blocked by pattern matching
-        incoming_by_type (defaultdict): Incoming bytes grouped by resource type
-        outgoing_by_type (defaultdict): Outgoing bytes grouped by resource type
-        blocked_urls (list): List of (url, reason) tuples for blocked URLs
-        content_js_requests (list): List of content.js request metadata
+        incoming_by_type (dict): Incoming bytes grouped by resource type
+                                 (preallocated, unseen types stay at 0)
+        outgoing_by_type (dict): Outgoing bytes grouped by resource type
+                                 (preallocated, unseen types stay at 0)
+        blocked_urls (deque): Most recent (url, reason) tuples for blocked URLs,
+                              bounded by MAX_BLOCKED_URLS_TRACKED (the full
+                              count is url_blocked_count)
+        content_js_requests (list): List of ContentJsRequest entries
         api_responses (list): List of captured API response data
+        api_responses_by_type (dict): Captured API responses bucketed by API type
+        get_creative_by_id_count (int): Number of GetCreativeById responses captured
+        search_creatives_count (int): Number of SearchCreatives responses captured
     
     Example:
         tracker = TrafficTracker()
@@ -105,6 +227,23 @@ class TrafficTracker:
         print(f"API responses captured: {len(tracker.api_responses)}")
     """
     
+    # Fixed attribute set: no per-instance __dict__, slot descriptors for access
+    __slots__ = (
+        'incoming_bytes',
+        'outgoing_bytes',
+        'request_count',
+        'blocked_count',
+        'url_blocked_count',
+        'incoming_by_type',
+        'outgoing_by_type',
+        'blocked_urls',
+        'content_js_requests',
+        'api_responses',
+        'api_responses_by_type',
+        'get_creative_by_id_count',
+        'search_creatives_count'
+    )
+    
     def __init__(self):
         self.incoming_bytes = 0
         self.outgoing_bytes = 0
@@ -112,15 +251,130 @@ class TrafficTracker:
         self.blocked_count = 0
         self.url_blocked_count = 0
         
-        self.incoming_by_type = defaultdict(int)
-        self.outgoing_by_type = defaultdict(int)
-        self.blocked_urls = []
+        # Preallocated for every known type: updates never go through
+        # defaultdict.__missing__ and the tables never resize mid-scrape
+        self.incoming_by_type = dict.fromkeys(_CONTENT_TYPE_CATEGORIES, 0)
+        self.outgoing_by_type = dict.fromkeys(_RESOURCE_TYPE_KEYS.values(), 0)
+        # Diagnostic only and bounded: a long page cannot grow it without limit
+        self.blocked_urls = deque(maxlen=MAX_BLOCKED_URLS_TRACKED)
         
         # Track content.js requests for creative ID extraction
         self.content_js_requests = []
         
         # Track API responses for real creative ID identification
+        # (api_responses keeps capture order; api_responses_by_type holds the
+        # same dicts bucketed by API type for direct per-endpoint access)
         self.api_responses = []
+        self.api_responses_by_type = {
+            API_GET_CREATIVE_BY_ID: [],
+            API_SEARCH_CREATIVES: [],
+            API_GET_ADVERTISER_BY_ID: []
+        }
+        
+        # Per-endpoint counters maintained by add_api_response() so the wait
+        # loop can check for an endpoint without rescanning api_responses
+        self.get_creative_by_id_count = 0
+        self.search_creatives_count = 0
+    
+    def add_api_response(self, url: str, text: str) -> Dict[str, Any]:
+        """
+        Classify and store a captured API response.
+        
+        The endpoint is classified once at capture time and the matching
+        per-endpoint counter is incremented, so consumers never need to
+        substring-scan api_responses to know whether an endpoint arrived.
+        The JSON body is also decoded here and cached under 'parsed', so the
+        analysis helpers polled by the wait loop never re-parse it.
+        
+        Args:
+            url: The API request URL.
+            text: The response body text.
+        
+        Returns:
+            The stored API response dictionary with 'url', 'text', 'type',
+            'timestamp', and 'parsed' keys ('parsed' is None for non-JSON bodies).
+        
+        Example:
+            tracker.add_api_response(url, await response.text())
+            if tracker.search_creatives_count > 0:
+                print("SearchCreatives arrived")
+        """
+        api_type = self._classify_api_url(url)
+        api_resp = {
+            'url': url,
+            'text': text,
+            'type': api_type,
+            'timestamp': time.time()
+        }
+        parse_api_response(api_resp)
+        self.api_responses.append(api_resp)
+        self.api_responses_by_type.setdefault(api_type, []).append(api_resp)
+        
+        if api_type == API_GET_CREATIVE_BY_ID:
+            self.get_creative_by_id_count += 1
+        elif api_type == API_SEARCH_CREATIVES:
+            self.search_creatives_count += 1
+        
+        return api_resp
+    
+    def get_api_responses(self, api_type: str) -> List[Dict[str, Any]]:
+        """
+        Return the captured API responses of one type, in capture order.
+        
+        For the known API types the returned list is the live bucket, so a
+        reference taken before capture starts sees later responses.
+        
+        Args:
+            api_type: API type string (e.g., API_GET_CREATIVE_BY_ID).
+        
+        Returns:
+            List of API response dictionaries of that type (empty if none).
+        
+        Example:
+            get_creative_responses = tracker.get_api_responses(API_GET_CREATIVE_BY_ID)
+        """
+        return self.api_responses_by_type.get(api_type, [])
+    
+    def get_incoming_by_type_sorted(self) -> Dict[str, int]:
+        """
+        Return incoming bytes per resource type, largest first.
+        
+        The returned dict preserves descending byte order, so result dicts
+        built from it can be displayed without re-sorting. Types that saw no
+        traffic are left out.
+        
+        Returns:
+            Plain dict mapping resource type to incoming bytes, sorted by bytes
+            in descending order.
+        
+        Example:
+            for resource_type, bytes_count in tracker.get_incoming_by_type_sorted().items():
+                print(resource_type, bytes_count)
+        """
+        return dict(sorted(
+            ((resource_type, bytes_count)
+             for resource_type, bytes_count in self.incoming_by_type.items()
+             if bytes_count),
+            key=lambda item: item[1],
+            reverse=True
+        ))
+    
+    def get_outgoing_by_type(self) -> Dict[str, int]:
+        """
+        Return outgoing bytes per resource type, without unseen types.
+        
+        Returns:
+            Plain dict mapping resource type to outgoing bytes for every type
+            that sent at least one request.
+        
+        Example:
+            result['outgoing_by_type'] = tracker.get_outgoing_by_type()
+        """
+        return {
+            resource_type: bytes_count
+            for resource_type, bytes_count in self.outgoing_by_type.items()
+            if bytes_count
+        }
     
     def should_block_url(self, url: str) -> Tuple[bool, Optional[str]]:
         """
@@ -148,7 +402,15 @@ class TrafficTracker:
                 return True, pattern
         return False, None
     
-    def on_request(self, request) -> None:
+    def on_request(
+        self,
+        request,
+        _overhead: int = REQUEST_SIZE_OVERHEAD,
+        _headers_size=_headers_size,
+        _cjs_prefix: str = CONTENT_JS_URL_PREFIX,
+        _cjs_filename: str = CONTENT_JS_FILENAME,
+        _time=time.time
+    ) -> None:
         """
         Handle request event and update traffic statistics.
         
@@ -164,30 +426,45 @@ class TrafficTracker:
         
         Note:
             Request size estimation includes:
-            - URL length (encoded as UTF-8)
+            - URL length in bytes (UTF-8)
             - All HTTP headers (formatted as "key: value\r\n")
             - REQUEST_SIZE_OVERHEAD constant (100 bytes for HTTP overhead)
+            
+            The underscore keyword arguments are not meant to be passed: they
+            bind module globals as locals once at definition time, since this
+            callback runs for every request of the page.
         """
-        url_size = len(request.url.encode())
-        headers_size = sum(len(f"{k}: {v}\r\n".encode()) for k, v in request.headers.items())
-        request_size = url_size + headers_size + REQUEST_SIZE_OVERHEAD
+        url = request.url
+        # URLs are ASCII (RFC 3986 percent-encodes the rest), so the character
+        # count is the byte count; isascii() is O(1) and avoids a bytes copy
+        url_size = len(url) if url.isascii() else len(url.encode())
+        headers_size = _headers_size(request.headers)
+        request_size = url_size + headers_size + _overhead
         
         self.outgoing_bytes += request_size
         self.request_count += 1
         
         resource_type = request.resource_type
-        self.outgoing_by_type[resource_type] += request_size
-        
-        # Track content.js requests
-        if CONTENT_JS_FILENAME in request.url and CONTENT_JS_DOMAIN in request.url:
-            creative_id = self._extract_creative_id_from_url(request.url)
-            self.content_js_requests.append({
-                'url': request.url,
-                'creative_id': creative_id,
-                'timestamp': time.time()
-            })
-    
-    def on_response(self, response) -> None:
+        resource_type = _RESOURCE_TYPE_KEYS.get(resource_type) or sys.intern(resource_type)
+        outgoing_by_type = self.outgoing_by_type
+        try:
+            outgoing_by_type[resource_type] += request_size
+        except KeyError:
+            # Resource type Playwright added after _RESOURCE_TYPE_KEYS was written
+            outgoing_by_type[resource_type] = request_size
+        
+        # Track content.js requests (prefix check fails fast for other hosts)
+        if url.startswith(_cjs_prefix) and _cjs_filename in url:
+            # creativeId is parsed lazily (ContentJsRequest.creative_id)
+            self.content_js_requests.append(ContentJsRequest(url, _time()))
+    
+    def on_response(
+        self,
+        response,
+        _overhead: int = REQUEST_SIZE_OVERHEAD,
+        _headers_size=_headers_size,
+        _classify_content_type=_classify_content_type
+    ) -> None:
         """
         Handle response event and update traffic statistics.
         
@@ -207,27 +484,36 @@ class TrafficTracker:
             - All HTTP response headers
             - REQUEST_SIZE_OVERHEAD constant (100 bytes)
             
-            Errors are silently caught to prevent disrupting page load.
+            Only the failures that can actually occur are caught (headers of a
+            disconnected response, a malformed Content-Length), so neither
+            disrupts page load and other errors are no longer masked.
+            
+            The underscore keyword arguments bind module globals as locals
+            (see on_request) and are not meant to be passed.
         """
+        # Playwright builds a new headers dict on every .headers access; it is
+        # the only call here that can fail for reasons outside our control
         try:
-            url = response.url
-            
-            content_length = response.headers.get('content-length')
-            if content_length:
-                body_size = int(content_length)
-            else:
-                body_size = 0
-            
-            headers_size = sum(len(f"{k}: {v}\r\n".encode()) for k, v in response.headers.items())
-            response_size = body_size + headers_size + REQUEST_SIZE_OVERHEAD
-            
-            self.incoming_bytes += response_size
-            
-            resource_type = self._detect_type_from_response(response)
-            self.incoming_by_type[resource_type] += response_size
-            
+            headers = response.headers
         except Exception:
-            pass
+            return
+        
+        body_size = 0
+        content_length = headers.get('content-length')
+        if content_length:
+            try:
+                body_size = int(content_length)
+            except ValueError:
+                pass  # Malformed Content-Length: count headers only
+        
+        headers_size = _headers_size(headers)
+        response_size = body_size + headers_size + _overhead
+        
+        self.incoming_bytes += response_size
+        
+        # Resource type from Content-Type (memoized per distinct header value)
+        resource_type = _classify_content_type(headers.get('content-type', ''))
+        self.incoming_by_type[resource_type] += response_size
     
     def on_request_failed(self, request) -> None:
         """
@@ -244,71 +530,35 @@ class TrafficTracker:
         """
         self.blocked_count += 1
     
-    def _detect_type_from_response(self, response) -> str:
+    @staticmethod
+    def _classify_api_url(url: str) -> str:
         """
-        Detect resource type from response Content-Type header.
-        
-        Maps Content-Type header values to resource type categories for
-        traffic analysis. Used to group bandwidth usage by resource type.
+        Classify an API URL by endpoint name.
         
         Args:
-            response: Playwright Response object with headers.
+            url: The API request URL.
         
         Returns:
-            Resource type string: 'image', 'stylesheet', 'script', 'font',
-            'media', 'document', 'xhr', or 'other'.
-        
-        Note:
-            Detection is case-insensitive and uses substring matching for
-            flexibility with various Content-Type formats.
-        """
-        content_type = response.headers.get('content-type', '').lower()
-        
-        if 'image/' in content_type:
-            return 'image'
-        elif 'text/css' in content_type:
-            return 'stylesheet'
-        elif 'javascript' in content_type:
-            return 'script'
-        elif 'font/' in content_type:
-            return 'font'
-        elif 'video/' in content_type or 'audio/' in content_type:
-            return 'media'
-        elif 'text/html' in content_type:
-            return 'document'
-        elif 'application/json' in content_type:
-            return 'xhr'
-        
-        return 'other'
-    
-    def _extract_creative_id_from_url(self, url: str) -> Optional[str]:
+            API_GET_CREATIVE_BY_ID, API_SEARCH_CREATIVES, API_GET_ADVERTISER_BY_ID,
+            or 'unknown' if the URL matches none of them.
         """
-        Extract 12-digit creative ID from content.js URL parameter.
-        
-        Parses the creativeId query parameter from content.js URLs using
-        the PATTERN_CREATIVE_ID_FROM_URL regex pattern.
-        
-        Args:
-            url: Content.js URL containing creativeId parameter.
-        
-        Returns:
-            12-digit creative ID string if found, None otherwise.
-        
-        Example:
-            url = 'https://displayads-formats.googleusercontent.com/ads/preview/content.js?creativeId=773510960098'
-            creative_id = tracker._extract_creative_id_from_url(url)
-            # Returns: '773510960098'
-        """
-        match = re.search(PATTERN_CREATIVE_ID_FROM_URL, url, re.IGNORECASE)
-        if match:
-            return match.group(1)
-        return None
+        if API_GET_CREATIVE_BY_ID in url:
+            return API_GET_CREATIVE_BY_ID
+        elif API_SEARCH_CREATIVES in url:
+            return API_SEARCH_CREATIVES
+        elif API_GET_ADVERTISER_BY_ID in url:
+            return API_GET_ADVERTISER_BY_ID
+        return 'unknown'
 
 
 # ============================================================================
 # HELPER FUNCTIONS FOR BROWSER SETUP
 # ============================================================================
 
+# Shared fake-useragent instance, created on first use by _get_user_agent()
+_USER_AGENT_GENERATOR = None
+
+
 def _get_user_agent() -> str:
     """
     Get user agent string for browser context.
@@ -324,11 +574,13 @@ def _get_user_agent() -> str:
         # With fake-useragent: 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
         # Without: 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     """
+    global _USER_AGENT_GENERATOR
     if FAKE_USERAGENT_AVAILABLE and USE_RANDOM_USER_AGENT:
         try:
-            ua = UserAgent(browsers=['Chrome'])
-            user_agent = ua.random
-            return user_agent
+            # Build the generator (and parse its UA database) once per process
+            if _USER_AGENT_GENERATOR is None:
+                _USER_AGENT_GENERATOR = UserAgent(browsers=['Chrome'])
+            return _USER_AGENT_GENERATOR.random
         except Exception:
             # Fallback to default if fake-useragent fails
             return USER_AGENT
@@ -336,6 +588,56 @@ def _get_user_agent() -> str:
         return USER_AGENT
 
 
+def _write_addon_script() -> None:
+    """
+    Write PROXY_ADDON_SCRIPT to MITM_ADDON_PATH unless it is already there.
+    
+    In batch runs the addon script is byte-identical between scrapes, so the
+    existing file is compared first and only rewritten when it is missing or
+    differs. Skipping the write also leaves the file's mtime untouched.
+    
+    Example:
+        _write_addon_script()
+        # /tmp/mitm_addon.py now holds the current PROXY_ADDON_SCRIPT
+    """
+    script = PROXY_ADDON_SCRIPT.encode('utf-8')
+    try:
+        with open(MITM_ADDON_PATH, 'rb') as f:
+            if f.read() == script:
+                return
+    except OSError:
+        pass
+    
+    with open(MITM_ADDON_PATH, 'wb') as f:
+        f.write(script)
+
+
+def _find_mitmdump() -> Optional[str]:
+    """
+    Locate a runnable mitmdump executable.
+    
+    Resolves each entry of MITMDUMP_SEARCH_PATHS with shutil.which(), which
+    searches $PATH for bare names and checks absolute paths for the executable
+    bit. Nothing is spawned: only existence and permissions matter for launching
+    the proxy, so the former `mitmdump --version` probe (a fork+exec per path,
+    blocking the event loop for up to SUBPROCESS_VERSION_CHECK_TIMEOUT each) is
+    not needed.
+    
+    Returns:
+        Path of the first executable mitmdump found, or None if none of the
+        search paths resolves.
+    
+    Example:
+        mitmdump_cmd = _find_mitmdump()
+        # '/usr/local/bin/mitmdump' or None
+    """
+    for path in MITMDUMP_SEARCH_PATHS:
+        resolved = shutil.which(path)
+        if resolved:
+            return resolved
+    return None
+
+
 async def _setup_proxy(
     use_proxy: bool,
     external_proxy: Optional[Dict[str, str]]
@@ -389,24 +691,15 @@ async def _setup_proxy(
     print("🔧 Starting mitmproxy...")
     # Write mitmproxy addon script to temporary file
     # This script counts request/response bytes and saves results to JSON
-    with open(MITM_ADDON_PATH, 'w') as f:
-        f.write(PROXY_ADDON_SCRIPT)
+    _write_addon_script()
     
-    if os.path.exists(PROXY_RESULTS_PATH):
-        os.remove(PROXY_RESULTS_PATH)
+    try:
+        os.unlink(PROXY_RESULTS_PATH)
+    except FileNotFoundError:
+        pass
     
     # Try to find mitmdump executable in common locations
-    # Tests each path by running --version command with timeout
-    mitmdump_paths = MITMDUMP_SEARCH_PATHS
-    mitmdump_cmd = None
-    
-    for path in mitmdump_paths:
-        try:
-            subprocess.run([path, '--version'], capture_output=True, timeout=SUBPROCESS_VERSION_CHECK_TIMEOUT)
-            mitmdump_cmd = path
-            break
-        except:
-            continue
+    mitmdump_cmd = _find_mitmdump()
     
     if mitmdump_cmd:
         proxy_process = subprocess.Popen(
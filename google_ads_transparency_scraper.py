@@ -263,7 +263,8 @@ from google_ads_config import (
     PROXY_RESULTS_PATH,
     EXIT_CODE_VALIDATION_FAILED,
     EXIT_CODE_ERROR,
-    JSON_OUTPUT_INDENT
+    JSON_OUTPUT_INDENT,
+    API_GET_CREATIVE_BY_ID
 )
 
 # Cache Integration - Import cache-aware route handler and statistics
@@ -289,8 +290,7 @@ from google_ads_browser import (
 # Content Processing - Import content pipeline functions
 from google_ads_content import (
     _smart_wait_for_content,
-    _identify_creative,
-    _extract_data
+    _identify_and_extract
 )
 
 # API Analysis - Import API parsing functions
@@ -396,7 +396,7 @@ async def scrape_ads_transparency_page(
             - outgoing_bytes (int): Bytes sent (request bodies)
             - total_bytes (int): Total bytes transferred (incoming + outgoing)
             - measurement_method (str): 'proxy' or 'estimation'
-            - incoming_by_type (Dict[str, int]): Incoming bytes grouped by resource type
+            - incoming_by_type (Dict[str, int]): Incoming bytes grouped by resource type (largest first)
             - outgoing_by_type (Dict[str, int]): Outgoing bytes grouped by resource type
         
         Request Statistics:
@@ -564,6 +564,10 @@ async def scrape_ads_transparency_page(
         total_bytes = tracker.incoming_bytes + tracker.outgoing_bytes
         measurement_method = 'estimation'
     
+    # These checks only read GetCreativeById: use the tracker's per-type bucket
+    # instead of rescanning every captured response
+    get_creative_responses = tracker.get_api_responses(API_GET_CREATIVE_BY_ID)
+    
     # Check for static/cached content (if not already detected in wait loop)
     if static_content_detected:
         static_content_info = static_content_detected
@@ -572,22 +576,23 @@ async def scrape_ads_transparency_page(
         print(f"\n🔍 Final check for static/cached content...")
         print(f"   API responses: {len(tracker.api_responses)}")
         static_content_info = check_if_static_cached_creative(
-            tracker.api_responses, 
+            get_creative_responses,
             page_url
         )
     
-    # Identify creative
-    creative_results = _identify_creative(tracker, page_url, static_content_info)
-    real_creative_id = creative_results['real_creative_id']
-    method_used = creative_results['method_used']
-    
     # Extract funded_by (sponsor company name) from API
-    funded_by = extract_funded_by_from_api(tracker.api_responses, page_url)
+    funded_by = extract_funded_by_from_api(get_creative_responses, page_url)
     # Extract country presence (best-effort)
-    country_presence = extract_country_presence_from_api(tracker.api_responses, page_url)
+    country_presence = extract_country_presence_from_api(get_creative_responses, page_url)
     
-    # Extract data
-    extraction_results = _extract_data(content_js_responses, found_fletch_renders, static_content_info, real_creative_id, debug_fletch, debug_appstore)
+    # Identify creative and extract data (run off the event loop)
+    creative_results, extraction_results = await _identify_and_extract(
+        tracker, page_url, static_content_info,
+        content_js_responses, found_fletch_renders,
+        debug_fletch, debug_appstore
+    )
+    real_creative_id = creative_results['real_creative_id']
+    method_used = creative_results['method_used']
     unique_videos = extraction_results['unique_videos']
     videos_by_request = extraction_results['videos_by_request']
     app_store_id = extraction_results['app_store_id']
@@ -657,8 +662,8 @@ async def scrape_ads_transparency_page(
         'duration_ms': duration_ms,
         
         # Details
-        'incoming_by_type': dict(tracker.incoming_by_type),
-        'outgoing_by_type': dict(tracker.outgoing_by_type),
+        'incoming_by_type': tracker.get_incoming_by_type_sorted(),
+        'outgoing_by_type': tracker.get_outgoing_by_type(),
         'content_js_requests': len(tracker.content_js_requests),
         'api_responses': len(tracker.api_responses),
         
@@ -265,7 +265,8 @@ from google_ads_config import (
     EXIT_CODE_VALIDATION_FAILED,
     EXIT_CODE_ERROR,
     JSON_OUTPUT_INDENT,
-    VERBOSE_LOGGING
+    VERBOSE_LOGGING,
+    API_GET_CREATIVE_BY_ID
 )
 
 # Cache Integration - Import cache-aware route handler and statistics
@@ -278,6 +279,7 @@ from google_ads_cache import (
 # Traffic Management - Import TrafficTracker class and proxy setup
 from google_ads_traffic import (
     TrafficTracker,
+    ContentJsRequest,
     _setup_proxy
 )
 
@@ -292,7 +294,8 @@ from google_ads_browser import (
 from google_ads_content import (
     _smart_wait_for_content,
     _identify_creative,
-    _extract_data
+    _extract_data,
+    _identify_and_extract
 )
 
 # API Analysis - Import API parsing functions
@@ -398,7 +401,7 @@ async def scrape_ads_transparency_page(
             - outgoing_bytes (int): Bytes sent (request bodies)
             - total_bytes (int): Total bytes transferred (incoming + outgoing)
             - measurement_method (str): 'proxy' or 'estimation'
-            - incoming_by_type (Dict[str, int]): Incoming bytes grouped by resource type
+            - incoming_by_type (Dict[str, int]): Incoming bytes grouped by resource type (largest first)
             - outgoing_by_type (Dict[str, int]): Outgoing bytes grouped by resource type
         
         Request Statistics:
@@ -566,6 +569,10 @@ async def scrape_ads_transparency_page(
         total_bytes = tracker.incoming_bytes + tracker.outgoing_bytes
         measurement_method = 'estimation'
     
+    # These checks only read GetCreativeById: use the tracker's per-type bucket
+    # instead of rescanning every captured response
+    get_creative_responses = tracker.get_api_responses(API_GET_CREATIVE_BY_ID)
+    
     # Check for static/cached content (if not already detected in wait loop)
     if static_content_detected:
         static_content_info = static_content_detected
@@ -574,22 +581,23 @@ async def scrape_ads_transparency_page(
         print(f"\n🔍 Final check for static/cached content...")
         print(f"   API responses: {len(tracker.api_responses)}")
         static_content_info = check_if_static_cached_creative(
-            tracker.api_responses, 
+            get_creative_responses,
             page_url
         )
     
-    # Identify creative
-    creative_results = _identify_creative(tracker, page_url, static_content_info)
-    real_creative_id = creative_results['real_creative_id']
-    method_used = creative_results['method_used']
-    
     # Extract funded_by (sponsor company name) from API
-    funded_by = extract_funded_by_from_api(tracker.api_responses, page_url)
+    funded_by = extract_funded_by_from_api(get_creative_responses, page_url)
     # Extract country presence (best-effort)
-    country_presence = extract_country_presence_from_api(tracker.api_responses, page_url)
+    country_presence = extract_country_presence_from_api(get_creative_responses, page_url)
     
-    # Extract data
-    extraction_results = _extract_data(content_js_responses, found_fletch_renders, static_content_info, real_creative_id, debug_fletch, debug_appstore)
+    # Identify creative and extract data (run off the event loop)
+    creative_results, extraction_results = await _identify_and_extract(
+        tracker, page_url, static_content_info,
+        content_js_responses, found_fletch_renders,
+        debug_fletch, debug_appstore
+    )
+    real_creative_id = creative_results['real_creative_id']
+    method_used = creative_results['method_used']
     unique_videos = extraction_results['unique_videos']
     videos_by_request = extraction_results['videos_by_request']
     app_store_id = extraction_results['app_store_id']
@@ -661,8 +669,8 @@ async def scrape_ads_transparency_page(
         'duration_ms': duration_ms,
         
         # Details
-        'incoming_by_type': dict(tracker.incoming_by_type),
-        'outgoing_by_type': dict(tracker.outgoing_by_type),
+        'incoming_by_type': tracker.get_incoming_by_type_sorted(),
+        'outgoing_by_type': tracker.get_outgoing_by_type(),
         'content_js_requests': len(tracker.content_js_requests),
         'api_responses': len(tracker.api_responses),
         
@@ -882,13 +890,7 @@ async def scrape_ads_transparency_api_only(
             print(f"  📝 Saved API request details to debug_api_request.json")
         
         # Track API request in tracker
-        api_resp_dict = {
-            'url': api_url,
-            'text': response_text,
-            'type': 'GetCreativeById',
-            'timestamp': time.time()
-        }
-        tracker.api_responses.append(api_resp_dict)
+        api_resp_dict = tracker.add_api_response(api_url, response_text)
         
     except Exception as e:
         # This catches any errors during debug saving or tracker update
@@ -1116,11 +1118,11 @@ async def scrape_ads_transparency_api_only(
             content_js_responses.append((url, content_text))
             
             # Track content.js in tracker
-            tracker.content_js_requests.append({
-                'url': url,
-                'text': content_text,
-                'timestamp': time.time()
-            })
+            tracker.content_js_requests.append(ContentJsRequest(
+                url=url,
+                timestamp=time.time(),
+                text=content_text
+            ))
             
             total_bytes += result['size']
             success_count += 1
@@ -1161,10 +1163,11 @@ async def scrape_ads_transparency_api_only(
     # STEP 4: Reuse Existing Extraction Logic
     # ========================================================================
     
-    # Extract funded_by from API
-    funded_by = extract_funded_by_from_api(tracker.api_responses, page_url)
+    # Extract funded_by from API (GetCreativeById bucket only)
+    get_creative_responses = tracker.get_api_responses(API_GET_CREATIVE_BY_ID)
+    funded_by = extract_funded_by_from_api(get_creative_responses, page_url)
     # Extract country presence (best-effort)
-    country_presence = extract_country_presence_from_api(tracker.api_responses, page_url)
+    country_presence = extract_country_presence_from_api(get_creative_responses, page_url)
     
     # Identify creative (from API or frequency)
     creative_results = _identify_creative(tracker, page_url, static_content_info)
@@ -1293,8 +1296,8 @@ async def scrape_ads_transparency_api_only(
         'duration_ms': duration_ms,
         
         # Details
-        'incoming_by_type': dict(tracker.incoming_by_type),
-        'outgoing_by_type': dict(tracker.outgoing_by_type),
+        'incoming_by_type': tracker.get_incoming_by_type_sorted(),
+        'outgoing_by_type': tracker.get_outgoing_by_type(),
         'content_js_requests': len(tracker.content_js_requests),
         'api_responses': len(tracker.api_responses),
         
@@ -27,6 +27,17 @@ logger = logging.getLogger(__name__)
 PROXY_ADDON_SCRIPT = f'''
 import json
 
+
+def _byte_len(s):
+    """UTF-8 byte length of s; headers/paths are ASCII in practice (isascii() is O(1))."""
+    return len(s) if s.isascii() else len(s.encode())
+
+
+def _headers_size(headers):
+    """Byte size of headers serialized as "key: value" + CRLF lines."""
+    return sum(_byte_len(k) + _byte_len(v) + 4 for k, v in headers.items())
+
+
 class TrafficCounter:
     def __init__(self):
         self.total_request_bytes = 0
@@ -36,8 +47,9 @@ class TrafficCounter:
     def request(self, flow):
         """Called for each request."""
         request_size = len(flow.request.raw_content) if flow.request.raw_content else 0
-        request_size += sum(len(f"{{k}}: {{v}}\\r\\n".encode()) for k, v in flow.request.headers.items())
-        request_size += len(f"{{flow.request.method}} {{flow.request.path}} HTTP/1.1\\r\\n".encode())
+        # "{{k}}: {{v}}\\r\\n" per header, "METHOD PATH HTTP/1.1\\r\\n" request line
+        request_size += _headers_size(flow.request.headers)
+        request_size += _byte_len(flow.request.method) + _byte_len(flow.request.path) + 12
         
         self.total_request_bytes += request_size
         self.request_count += 1
@@ -52,7 +64,7 @@ class TrafficCounter:
         else:
             body_size = 0
         
-        headers_size = sum(len(f"{{k}}: {{v}}\\r\\n".encode()) for k, v in flow.response.headers.items())
+        headers_size = _headers_size(flow.response.headers)
         response_size = body_size + headers_size
         
         self.total_response_bytes += response_size
@@ -90,7 +90,7 @@ try:
         extract_funded_by_from_api,
         extract_country_presence_from_api
     )
-    from google_ads_config import ENABLE_STEALTH_MODE
+    from google_ads_config import ENABLE_STEALTH_MODE, API_GET_CREATIVE_BY_ID
     from playwright.async_api import async_playwright
 except ImportError as e:
     print(f"ERROR: Could not import required functions: {e}")
@@ -585,9 +585,11 @@ async def scrape_batch_optimized(
                 print(f"    ⏱️  [{time.time() - batch_start:.2f}s] Content loaded, extracting data...")
                 
                 # Extract data (same as scrape_ads_transparency_page)
-                static_content_info = check_if_static_cached_creative(tracker.api_responses, first_url)
-                funded_by = extract_funded_by_from_api(tracker.api_responses, first_url)
-                country_presence = extract_country_presence_from_api(tracker.api_responses, first_url)
+                # (GetCreativeById-only checks read the tracker's per-type bucket)
+                get_creative_responses = tracker.get_api_responses(API_GET_CREATIVE_BY_ID)
+                static_content_info = check_if_static_cached_creative(get_creative_responses, first_url)
+                funded_by = extract_funded_by_from_api(get_creative_responses, first_url)
+                country_presence = extract_country_presence_from_api(get_creative_responses, first_url)
                 
                 # Identify creative
                 creative_results = _identify_creative(tracker, first_url, static_content_info)
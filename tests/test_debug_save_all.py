@@ -191,9 +191,9 @@ async def test_and_save_all_debug_data():
         tracker_data = {
             'content_js_requests': [
                 {
-                    'url': req['url'],
-                    'text_length': len(req['text']),
-                    'text_preview': req['text'][:500]
+                    'url': req.url,
+                    'text_length': len(req.text or ''),
+                    'text_preview': (req.text or '')[:500]
                 }
                 for req in tracker.content_js_requests
             ],
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Behaviour tests for the traffic tracker and debug helpers.
+
+Covers (no browser, proxy or network needed):
+1. TrafficTracker.add_api_response() / get_api_responses() buckets and counters
+2. ContentJsRequest.creative_id (parsed lazily from the content.js URL)
+3. DEBUG_MAX_BYTES cap on debug file content
+4. _unescape_url_fragment() against the codecs 'unicode-escape' decoder
+
+Usage:
+    python3 tests/test_tracker_helpers.py
+    python3 -m pytest -q tests/test_tracker_helpers.py
+"""
+
+import codecs
+import os
+import sys
+import tarfile
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import google_ads_debug
+from google_ads_api_analysis import _unescape_url_fragment
+from google_ads_config import (
+    API_GET_CREATIVE_BY_ID,
+    API_SEARCH_CREATIVES,
+    API_GET_ADVERTISER_BY_ID
+)
+from google_ads_traffic import ContentJsRequest, TrafficTracker
+
+API_BASE = "https://adstransparency.google.com/anji/_/rpc/LookupService/"
+CONTENT_JS_BASE = "https://displayads-formats.googleusercontent.com/ads/preview/content.js"
+
+
+def test_add_api_response_buckets():
+    """Responses are classified once and bucketed by type, in capture order."""
+    tracker = TrafficTracker()
+
+    # Bucket references taken before capture are live views
+    get_creative_bucket = tracker.get_api_responses(API_GET_CREATIVE_BY_ID)
+    assert get_creative_bucket == []
+
+    first = tracker.add_api_response(API_BASE + API_GET_CREATIVE_BY_ID, '{"1": {"2": "CR1"}}')
+    search = tracker.add_api_response(API_BASE + API_SEARCH_CREATIVES + "?x=1", '{}')
+    second = tracker.add_api_response(API_BASE + API_GET_CREATIVE_BY_ID, 'not json')
+    advertiser = tracker.add_api_response(API_BASE + API_GET_ADVERTISER_BY_ID, '[]')
+
+    assert first['type'] == API_GET_CREATIVE_BY_ID
+    assert search['type'] == API_SEARCH_CREATIVES
+    assert advertiser['type'] == API_GET_ADVERTISER_BY_ID
+
+    # JSON is decoded once at capture; non-JSON bodies cache None
+    assert first['parsed'] == {"1": {"2": "CR1"}}
+    assert search['parsed'] == {}
+    assert second['parsed'] is None
+
+    assert get_creative_bucket == [first, second]
+    assert get_creative_bucket[0] is first
+    assert tracker.get_api_responses(API_SEARCH_CREATIVES) == [search]
+    assert tracker.get_api_responses(API_GET_ADVERTISER_BY_ID) == [advertiser]
+    assert tracker.api_responses == [first, search, second, advertiser]
+
+    assert tracker.get_creative_by_id_count == 2
+    assert tracker.search_creatives_count == 1
+
+
+def test_get_api_responses_unknown_type():
+    """Unrecognised endpoints get their own 'unknown' bucket."""
+    tracker = TrafficTracker()
+    assert tracker.get_api_responses('unknown') == []
+
+    other = tracker.add_api_response(API_BASE + "SomethingElse", '{}')
+    assert other['type'] == 'unknown'
+    assert tracker.get_api_responses('unknown') == [other]
+    assert tracker.get_creative_by_id_count == 0
+    assert tracker.search_creatives_count == 0
+
+
+def test_content_js_request_creative_id():
+    """creative_id is read from the creativeId query parameter on access."""
+    request = ContentJsRequest(CONTENT_JS_BASE + "?htmlParentId=fletch-render-1&creativeId=773510960098", 1.0)
+    assert request.creative_id == '773510960098'
+    assert request.text is None
+
+    # Query parameter name is matched case-insensitively
+    request = ContentJsRequest(CONTENT_JS_BASE + "?CREATIVEID=123456789012", 1.0, 'body')
+    assert request.creative_id == '123456789012'
+    assert request.text == 'body'
+
+    assert ContentJsRequest(CONTENT_JS_BASE + "?htmlParentId=x", 1.0).creative_id is None
+
+
+def test_debug_max_bytes_cap():
+    """Content over DEBUG_MAX_BYTES is cut and marked; 0 keeps everything."""
+    saved = google_ads_debug.DEBUG_MAX_BYTES
+    try:
+        google_ads_debug.DEBUG_MAX_BYTES = 0
+        assert google_ads_debug._truncate_debug_content('x' * 100) == 'x' * 100
+
+        google_ads_debug.DEBUG_MAX_BYTES = 10
+        assert google_ads_debug._truncate_debug_content('x' * 10) == 'x' * 10
+        assert google_ads_debug._truncate_debug_content('x' * 25) == (
+            'x' * 10 + "\n... [TRUNCATED 15 bytes]\n"
+        )
+    finally:
+        google_ads_debug.DEBUG_MAX_BYTES = saved
+
+
+def test_debug_max_bytes_env_parsing():
+    """The environment value is read as a non-negative int; junk disables the cap."""
+    saved = os.environ.get('DEBUG_MAX_BYTES')
+    try:
+        for value, expected in (('4096', 4096), ('', 0), ('abc', 0), ('-5', 0)):
+            os.environ['DEBUG_MAX_BYTES'] = value
+            assert google_ads_debug._read_debug_max_bytes() == expected, value
+        del os.environ['DEBUG_MAX_BYTES']
+        assert google_ads_debug._read_debug_max_bytes() == 0
+    finally:
+        if saved is None:
+            os.environ.pop('DEBUG_MAX_BYTES', None)
+        else:
+            os.environ['DEBUG_MAX_BYTES'] = saved
+
+
+def test_debug_max_bytes_applied_to_files():
+    """save_debug_file() and the content.js archive both write capped content."""
+    saved_cap = google_ads_debug.DEBUG_MAX_BYTES
+    saved_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            os.chdir(tmp_dir)
+            google_ads_debug.DEBUG_MAX_BYTES = 8
+
+            google_ads_debug.save_debug_file(
+                "TEST", "capped.txt", ("Index: 1",), "0123456789abcdef",
+                print_success=False
+            )
+            google_ads_debug.save_all_content_js_debug_files([
+                (CONTENT_JS_BASE + "?creativeId=123456789012", "ABCDEFGHIJKLMNOP")
+            ])
+            google_ads_debug.flush_debug_files()
+
+            debug_dir = os.path.join(tmp_dir, 'debug')
+            with open(os.path.join(debug_dir, 'capped.txt'), encoding='utf-8') as f:
+                text = f.read()
+            assert "01234567\n... [TRUNCATED 8 bytes]\n" in text
+            assert "89abcdef" not in text
+
+            archives = [name for name in os.listdir(debug_dir) if name.endswith('.tar')]
+            assert len(archives) == 1
+            with tarfile.open(os.path.join(debug_dir, archives[0])) as tar:
+                member = tar.getmembers()[0]
+                body = tar.extractfile(member).read().decode('utf-8')
+            assert "ABCDEFGH\n... [TRUNCATED 8 bytes]\n" in body
+            # Header still reports the original size
+            assert "Content.js Size: 16 bytes" in body
+        finally:
+            google_ads_debug.DEBUG_MAX_BYTES = saved_cap
+            os.chdir(saved_cwd)
+
+
+def test_unescape_url_fragment_matches_codecs():
+    """The str.replace fast path decodes exactly like codecs 'unicode-escape'."""
+    fragments = [
+        CONTENT_JS_BASE + "?htmlParentId\\u003dfletch-render-13006300890096633430\\u0026creativeId\\u003d773510960098",
+        CONTENT_JS_BASE + "?a\\u003D1\\u0026b\\u003d2",
+        # Escapes outside the fast path go through the codecs fallback
+        CONTENT_JS_BASE + "?a\\u003d1\\x26b\\u002fc",
+        CONTENT_JS_BASE + "?a=1\\\\u003d",
+        # Nothing to decode: returned as-is
+        CONTENT_JS_BASE + "?htmlParentId=fletch-render-1&creativeId=1",
+    ]
+    for fragment in fragments:
+        assert _unescape_url_fragment(fragment) == codecs.decode(fragment, 'unicode-escape'), fragment
+
+
+def test_unescape_url_fragment_invalid_escape():
+    """A fragment the codecs decoder rejects is returned unchanged."""
+    fragment = CONTENT_JS_BASE + "?a\\u003d1\\u12"
+    assert _unescape_url_fragment(fragment) == fragment
+
+
+if __name__ == "__main__":
+    print("="*60)
+    print("TRAFFIC TRACKER / DEBUG HELPER TESTS")
+    print("="*60)
+
+    tests = [
+        ("API response buckets", test_add_api_response_buckets),
+        ("Unknown API type bucket", test_get_api_responses_unknown_type),
+        ("ContentJsRequest.creative_id", test_content_js_request_creative_id),
+        ("DEBUG_MAX_BYTES cap", test_debug_max_bytes_cap),
+        ("DEBUG_MAX_BYTES env parsing", test_debug_max_bytes_env_parsing),
+        ("DEBUG_MAX_BYTES in written files", test_debug_max_bytes_applied_to_files),
+        ("URL fragment unescape vs codecs", test_unescape_url_fragment_matches_codecs),
+        ("URL fragment invalid escape", test_unescape_url_fragment_invalid_escape),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for test_name, test_func in tests:
+        print(f"\n🧪 Running: {test_name}")
+        try:
+            test_func()
+            passed += 1
+            print(f"✅ {test_name} passed")
+        except AssertionError as e:
+            print(f"❌ {test_name} failed: {e}")
+
+    print("\n" + "="*60)
+    print(f"TEST RESULTS: {passed}/{total} tests passed")
+    print("="*60)
+    sys.exit(0 if passed == total else 1)